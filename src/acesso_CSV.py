@@ -1,18 +1,49 @@
 # Importa a biblioteca necessária para manipulação de dados
+import os                          # Identifica o formato pela extensão do arquivo
 import pandas as pd
+import pyarrow as pa               # Tipos Arrow das colunas lidas
+import pyarrow.csv as pa_csv       # Leitor de CSV multithread do Arrow (usado direto em load_data)
+import pyarrow.feather as feather  # Leitura/gravação no formato Feather (Arrow IPC)
+import pyarrow.parquet as pq       # Leitura no formato Parquet com memory-map
 
-# Carrega diretamente o arquivo CSV — mas essa linha provavelmente está aqui só para testar (ver observação abaixo)
-csv_path = pd.read_csv('..\data\dados_clientes_sujos_3000_v2.csv')  
+# Esquema declarado das colunas do CSV de entrada.
+# Os campos livres são lidos como texto em Arrow (bem mais compacto que objetos Python) e não são
+# convertidos na leitura: a conversão de tipos (idade, datas, moeda) é feita pelas funções de tratamento,
+# que sabem lidar com valores sujos. 'produto_id' e 'ativo' têm poucos valores distintos e viram categorias.
+ESQUEMA_CSV = {
+    'nome_cliente': 'string[pyarrow]',
+    'email': 'string[pyarrow]',
+    'idade': 'string[pyarrow]',
+    'data_compra': 'string[pyarrow]',
+    'valor_compra': 'string[pyarrow]',
+    'produto_id': 'category',
+    'ativo': 'category',
+}
+
+# dtype do esquema -> tipo Arrow lido direto pelo pyarrow.csv (os demais dtypes usam o pd.read_csv)
+TIPOS_ARROW = {
+    'string[pyarrow]': pa.string(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+}
+
+# Textos lidos como nulos: os mesmos do pd.read_csv, para o resultado não depender do leitor
+VALORES_NULOS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                 '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
 
 
 #---------------------------------------------#
 # Função para carregar dados de um arquivo CSV
 #---------------------------------------------#
-def load_data(csv_path):
-    """Carrega os dados do arquivo CSV informado no caminho."""
+def load_data(csv_path, esquema=None):
+    """Carrega os dados do arquivo CSV informado no caminho, com os tipos de `esquema` (padrão: ESQUEMA_CSV)."""
+    esquema = esquema or ESQUEMA_CSV
 
     try:
-        df = pd.read_csv(csv_path)  # Tenta carregar os dados a partir do caminho do arquivo
+        if all(str(tipo) in TIPOS_ARROW for tipo in esquema.values()):
+            df = _ler_com_arrow(csv_path, esquema)
+        else:
+            # Leitura multithread do pyarrow, já com os tipos do esquema (sem inferência coluna a coluna)
+            df = pd.read_csv(csv_path, engine='pyarrow', usecols=list(esquema), dtype=esquema)
         print("✅ Dados carregados com sucesso.")
         return df  # Retorna o DataFrame carregado
     except Exception as e:
@@ -20,6 +51,35 @@ def load_data(csv_path):
         print(f"❌ Erro ao carregar os dados: {e}")
         raise  # Levanta o erro novamente para interromper o fluxo, se necessário
 
+# Leitura direta pelo pyarrow.csv: cada coluna já sai no tipo Arrow do esquema, sem a inferência e a
+# conversão que o engine='pyarrow' do pandas faz depois (que custava mais que a própria leitura e
+# transformava, por exemplo, a idade '19' no texto '19.0'). As categorias são ordenadas como no pd.read_csv.
+def _ler_com_arrow(csv_path, esquema):
+    opcoes = pa_csv.ConvertOptions(
+        column_types={coluna: TIPOS_ARROW[str(tipo)] for coluna, tipo in esquema.items()},
+        include_columns=list(esquema), null_values=VALORES_NULOS, strings_can_be_null=True)
+    tabela = pa_csv.read_csv(csv_path, convert_options=opcoes)
+    df = tabela.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    for coluna in df.select_dtypes('category'):
+        df[coluna] = df[coluna].cat.reorder_categories(sorted(df[coluna].cat.categories))
+    return df
+
+#-----------------------------------------------------------#
+# Função para carregar os dados do CSV em blocos (streaming)
+#-----------------------------------------------------------#
+def load_data_chunks(csv_path, chunksize=100_000, esquema=None):
+    """Lê o CSV em blocos de `chunksize` linhas, devolvendo um DataFrame por vez."""
+    esquema = esquema or ESQUEMA_CSV
+
+    try:
+        # O engine 'pyarrow' não lê em blocos; o engine padrão aplica o mesmo esquema bloco a bloco
+        leitor = pd.read_csv(csv_path, chunksize=chunksize, usecols=list(esquema), dtype=esquema)
+        print(f"✅ Leitura em blocos de {chunksize} linhas iniciada.")
+        yield from leitor  # Entrega cada bloco conforme for sendo lido
+    except Exception as e:
+        print(f"❌ Erro ao carregar os dados em blocos: {e}")
+        raise
+
 #-----------------------------------------------------#
 # Função para salvar os dados tratados em um novo CSV
 #-----------------------------------------------------#
@@ -33,3 +93,71 @@ def save_cleaned_data(df, output_path):
         # Caso ocorra algum erro durante a gravação (ex: permissão negada, caminho inválido, etc)
         print(f"❌ Erro ao salvar os dados: {e}")
         raise  # Levanta o erro novamente para depuração
+
+#--------------------------------------------------------------#
+# Função para acrescentar um bloco de dados tratados a um CSV
+#--------------------------------------------------------------#
+def append_cleaned_data(df, output_path, primeiro_bloco):
+    """Grava o bloco no CSV: o primeiro bloco cria o arquivo com cabeçalho, os seguintes são acrescentados."""
+
+    try:
+        df.to_csv(
+            output_path,
+            mode='w' if primeiro_bloco else 'a',  # Sobrescreve no primeiro bloco e acrescenta nos demais
+            header=primeiro_bloco,                # Cabeçalho só uma vez
+            index=False
+        )
+    except Exception as e:
+        print(f"❌ Erro ao acrescentar dados em '{output_path}': {e}")
+        raise
+
+#------------------------------------------------------------------#
+# Funções para salvar os dados tratados em formatos binários colunares
+#------------------------------------------------------------------#
+def save_cleaned_data_parquet(df, output_path, compressao='snappy'):
+    """Salva os dados tratados em Parquet, preservando os tipos (Int64, datas, booleanos, float)."""
+
+    try:
+        df.to_parquet(output_path, index=False, compression=compressao)  # 'snappy', 'zstd', 'gzip' ou None
+        print(f"✅ Dados salvos em Parquet em '{output_path}'.")
+    except Exception as e:
+        print(f"❌ Erro ao salvar os dados em Parquet: {e}")
+        raise
+
+def save_cleaned_data_feather(df, output_path, compressao='lz4'):
+    """
+    Salva os dados tratados em Feather (Arrow IPC), preservando os tipos.
+    Com compressao='uncompressed', a leitura com memory-map não precisa copiar os dados.
+    """
+
+    try:
+        df.reset_index(drop=True).to_feather(output_path, compression=compressao)  # 'lz4', 'zstd' ou 'uncompressed'
+        print(f"✅ Dados salvos em Feather em '{output_path}'.")
+    except Exception as e:
+        print(f"❌ Erro ao salvar os dados em Feather: {e}")
+        raise
+
+#------------------------------------------------------------------#
+# Função para carregar os dados tratados em formato binário
+#------------------------------------------------------------------#
+def load_cleaned_data(path, colunas=None):
+    """
+    Carrega um arquivo Parquet ou Feather (.feather/.arrow) com memory-map, já com os tipos corretos.
+    Use `colunas` para ler só as colunas necessárias (as demais nem são lidas do disco).
+    """
+
+    try:
+        extensao = os.path.splitext(path)[1].lower()
+        if extensao == '.parquet':
+            tabela = pq.read_table(path, columns=colunas, memory_map=True)
+        elif extensao in ('.feather', '.arrow'):
+            tabela = feather.read_table(path, columns=colunas, memory_map=True)
+        else:
+            raise ValueError(f"Formato não suportado: '{extensao}' (use .parquet, .feather ou .arrow).")
+
+        df = tabela.to_pandas()
+        print(f"✅ Dados tratados carregados de '{path}'.")
+        return df
+    except Exception as e:
+        print(f"❌ Erro ao carregar os dados tratados: {e}")
+        raise
@@ -0,0 +1,251 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import os                                        # Número de núcleos disponíveis
+from concurrent.futures import ThreadPoolExecutor # Fatias da coluna processadas em paralelo
+import numpy as np                               # Máscaras e arrays de resultado
+import pandas as pd                              # Entrada e saída continuam sendo Series do pandas
+import pyarrow as pa                             # Arrays colunares do Apache Arrow
+import pyarrow.compute as pc                     # Funções vetorizadas em código nativo sobre arrays Arrow
+
+import tratar_CSV   # Regras de referência (backend 'pandas'), constantes e registro de backends
+
+#-------------------------#
+# Backend 'arrow'
+#-------------------------#
+# Implementa as mesmas regras de tratar_CSV.py com pyarrow.compute: cada coluna vira um array Arrow,
+# é dividida em fatias tratadas em threads (as funções do Arrow liberam o GIL) e volta como Series.
+# O resultado é idêntico ao do backend 'pandas'. As linhas em que o Arrow e o Python podem divergir
+# (caracteres fora do Latin-1 em maiúsculas/minúsculas, \w com Unicode, números e datas fora dos
+# formatos comuns) formam um "resíduo", tratado pela função pandas de referência só nessas linhas.
+
+# Tamanho mínimo de fatia para valer a pena usar mais de uma thread
+LINHAS_POR_THREAD = 100_000
+
+# Caracteres que o str.strip() do Python remove (os mesmos de REGEX_ESPACOS)
+ESPACOS = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+
+# Regras compartilhadas com o backend pandas (ver tratar_CSV.py)
+REGEX_FORA_LATIN1 = tratar_CSV.REGEX_FORA_LATIN1
+REGEX_EMAIL_ASCII = tratar_CSV.REGEX_EMAIL_ASCII
+
+# Número decimal simples (o que o float() aceita além disso, como "1_000" ou "inf", vai para o resíduo)
+REGEX_NUMERO_SIMPLES = r'^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$'
+
+# Partes das datas, iguais às que o parser do pandas aceita para cada diretiva
+PARTES_DATA = {
+    '%d': '(?P<d>3[01]|[12][0-9]|0[1-9]|[1-9])',
+    '%m': '(?P<m>1[0-2]|0[1-9]|[1-9])',
+    '%Y': '(?P<Y>[0-9]{4})',
+}
+
+# Anos representáveis em datetime64[ns] (fora disso o pandas devolve NaT e o valor vai para o resíduo)
+ANO_MINIMO, ANO_MAXIMO = 1678, 2261
+
+#---------------------------------------------------
+# Funções auxiliares
+#---------------------------------------------------
+
+# Converte uma coluna de texto para um array Arrow de strings
+def _para_arrow(serie):
+    texto = pa.array(serie, from_pandas=True)  # Colunas 'string[pyarrow]' chegam como large_string
+    texto = texto.combine_chunks() if isinstance(texto, pa.ChunkedArray) else texto
+    return texto.cast(pa.string())
+
+# Executa `nucleo` (array -> tupla de arrays) em fatias paralelas e junta os resultados na ordem
+def _em_paralelo(nucleo, texto):
+    partes = min(os.cpu_count() or 1, len(texto) // LINHAS_POR_THREAD)
+    if partes <= 1:
+        return nucleo(texto)
+    tamanho = -(-len(texto) // partes)
+    fatias = [texto.slice(inicio, tamanho) for inicio in range(0, len(texto), tamanho)]
+    with ThreadPoolExecutor(max_workers=partes) as executor:
+        resultados = list(executor.map(nucleo, fatias))
+    return tuple(pa.concat_arrays([resultado[i] for resultado in resultados]) for i in range(len(resultados[0])))
+
+# Converte uma máscara booleana do Arrow (nulos = False) para numpy
+def _mascara(array):
+    return pc.fill_null(array, False).to_numpy(zero_copy_only=False)
+
+# Recalcula com a função pandas de referência as linhas marcadas no resíduo
+def _completar_residuo(resultado, serie, residuo, referencia):
+    if residuo.any():
+        posicoes = np.flatnonzero(residuo)
+        resultado = resultado.copy() if resultado.dtype != object else resultado.astype(object)
+        resultado.iloc[posicoes] = referencia(serie.iloc[posicoes]).to_numpy()
+    return resultado
+
+# Aplica a operação Arrow só às categorias de uma coluna 'category' e espalha pelos códigos
+def _por_categorias(funcao, serie):
+    distintos = pd.Series(np.append(serie.cat.categories.to_numpy(dtype=object), np.nan))
+    resultado = funcao(distintos).take(serie.cat.codes.to_numpy())  # Código -1 (nulo) pega o último valor
+    resultado.index, resultado.name = serie.index, serie.name
+    return resultado.infer_objects() if resultado.dtype == object else resultado
+
+# Decide entre o caminho Arrow e a função pandas de referência, conforme o tipo da coluna
+def _operacao_arrow(referencia):
+    def decorador(funcao):
+        def executar(serie):
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                return _por_categorias(executar, serie)
+            if serie.empty or not tratar_CSV._somente_texto(serie):
+                return referencia(serie)  # Valores que não são texto: mesmas regras da versão pandas
+            return funcao(serie)
+        executar.__name__, executar.__doc__ = funcao.__name__, funcao.__doc__
+        return executar
+    return decorador
+
+#---------------------------------------------------
+# 1. Nomes
+#---------------------------------------------------
+def _nucleo_nomes(texto):
+    nomes = pc.utf8_trim(texto, ESPACOS)
+    nomes = pc.replace_substring_regex(nomes, tratar_CSV.REGEX_PREFIXO_NOME.pattern, '', max_replacements=1)
+    nomes = pc.utf8_lower(nomes)
+    nomes = pc.utf8_trim(pc.replace_substring_regex(nomes, tratar_CSV.REGEX_ESPACOS.pattern, ' '), ESPACOS)
+    so_inicial = pc.match_substring_regex(nomes, f'^{tratar_CSV.REGEX_NOME_INICIAL.pattern}$')
+    nomes = pc.if_else(so_inicial, '', pc.utf8_title(nomes))
+    return nomes, pc.match_substring_regex(texto, REGEX_FORA_LATIN1)
+
+@_operacao_arrow(tratar_CSV.limpar_nomes_coluna)
+def limpar_nomes_coluna(serie):
+    """Versão Arrow de `tratar_CSV.limpar_nomes_coluna`."""
+    nomes, residuo = _em_paralelo(_nucleo_nomes, _para_arrow(serie))
+    resultado = pd.Series(nomes.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+    resultado = _completar_residuo(resultado, serie, _mascara(residuo), tratar_CSV.limpar_nomes_coluna)
+    return tratar_CSV._de_volta(resultado, serie)
+
+#---------------------------------------------------
+# 2. E-mails
+#---------------------------------------------------
+def _nucleo_emails(texto):
+    ausente = pc.fill_null(pc.equal(pc.utf8_trim(texto, ESPACOS), ''), True)
+    valido = pc.fill_null(pc.match_substring_regex(texto, REGEX_EMAIL_ASCII), False)
+    invalido = pc.binary_join_element_wise('E-mail "', texto, '" inválido', '')
+    emails = pc.if_else(ausente, 'E-mail inválido ou não cadastrado', pc.if_else(valido, texto, invalido))
+    return emails, pc.invert(pc.string_is_ascii(texto))
+
+@_operacao_arrow(tratar_CSV.tratar_emails_coluna)
+def tratar_emails_coluna(serie):
+    """Versão Arrow de `tratar_CSV.tratar_emails_coluna`."""
+    emails, residuo = _em_paralelo(_nucleo_emails, _para_arrow(serie))
+    resultado = pd.Series(emails.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+    return _completar_residuo(resultado, serie, _mascara(residuo), tratar_CSV.tratar_emails_coluna)
+
+#---------------------------------------------------
+# 3. Idades
+#---------------------------------------------------
+def _nucleo_idades(texto):
+    aparado = pc.utf8_trim(texto, ESPACOS)
+    vazio = pc.fill_null(pc.equal(aparado, ''), True)
+    simples = pc.and_(pc.match_substring_regex(aparado, REGEX_NUMERO_SIMPLES), pc.invert(vazio))
+    numeros = pc.cast(pc.if_else(simples, aparado, pa.scalar(None, pa.string())), pa.float64())
+    inteiros = pc.trunc(numeros)  # int(float(valor)) trunca em direção ao zero
+    fora_do_int64 = pc.greater_equal(pc.abs(inteiros), 2.0 ** 63)
+    residuo = pc.or_(pc.and_(pc.invert(vazio), pc.invert(pc.fill_null(simples, False))), pc.fill_null(fora_do_int64, False))
+    return inteiros, residuo
+
+@_operacao_arrow(tratar_CSV.converter_idades_coluna)
+def converter_idades_coluna(serie):
+    """Versão Arrow de `tratar_CSV.converter_idades_coluna`."""
+    inteiros, residuo = _em_paralelo(_nucleo_idades, _para_arrow(serie))
+    residuo = _mascara(residuo)
+    valores = inteiros.to_numpy(zero_copy_only=False)
+    valores[residuo] = np.nan  # Preenchidos pela versão pandas logo abaixo
+    resultado = pd.Series(pd.array(valores, dtype='Int64'), index=serie.index, name=serie.name)
+    return _completar_residuo(resultado, serie, residuo, tratar_CSV.converter_idades_coluna)
+
+#---------------------------------------------------
+# 4. Datas
+#---------------------------------------------------
+
+# Expressão regular equivalente a cada formato de tratar_CSV.FORMATOS_DATA
+def _regex_formato(formato):
+    if formato == '%Y-%m-%d':  # No pandas este formato usa o parser ISO, que exige dia e mês com dois dígitos
+        return r'^(?P<Y>[0-9]{4})-(?P<m>[0-9]{2})-(?P<d>[0-9]{2})$'
+    regex = formato
+    for diretiva, parte in PARTES_DATA.items():
+        regex = regex.replace(diretiva, parte)
+    return f'^{regex}$'
+
+def _nucleo_datas(texto):
+    vazio = pc.fill_null(pc.equal(pc.utf8_trim(texto, ESPACOS), ''), True)
+    datas = pa.nulls(len(texto), pa.timestamp('ns'))
+    pendentes = pc.invert(vazio)
+
+    # Cada formato na mesma ordem da versão pandas: vale o primeiro que produzir uma data válida
+    for formato in tratar_CSV.FORMATOS_DATA:
+        partes = pc.extract_regex(pc.if_else(pendentes, texto, pa.scalar(None, pa.string())), _regex_formato(formato))
+        ano, dia = pc.struct_field(partes, 'Y'), pc.struct_field(partes, 'd')
+        iso = pc.binary_join_element_wise(ano, pc.utf8_lpad(pc.struct_field(partes, 'm'), 2, '0'),
+                                          pc.utf8_lpad(dia, 2, '0'), '-')
+        convertidas = pc.strptime(iso, format='%Y-%m-%d', unit='ns', error_is_null=True)
+
+        # Rejeita datas inexistentes (ex: 31/02), que o strptime poderia ajustar para o mês seguinte:
+        # nesse caso o dia da data convertida difere do dia escrito
+        existe = pc.equal(pc.day(convertidas), pc.cast(dia, pa.int64()))
+        anos = pc.cast(ano, pa.int32())
+        no_intervalo = pc.and_(pc.greater_equal(anos, ANO_MINIMO), pc.less_equal(anos, ANO_MAXIMO))
+        validas = pc.fill_null(pc.and_(existe, no_intervalo), False)
+
+        datas = pc.if_else(validas, convertidas, datas)
+        pendentes = pc.and_(pendentes, pc.invert(validas))
+
+    return datas, pendentes  # O que sobrou (formatos incomuns ou inválidos) vai para o resíduo
+
+@_operacao_arrow(tratar_CSV.converter_datas_coluna)
+def converter_datas_coluna(serie):
+    """Versão Arrow de `tratar_CSV.converter_datas_coluna`."""
+    datas, residuo = _em_paralelo(_nucleo_datas, _para_arrow(serie))
+    resultado = pd.Series(datas.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+    return _completar_residuo(resultado.astype('datetime64[ns]'), serie, _mascara(residuo),
+                              tratar_CSV.converter_datas_coluna)
+
+#---------------------------------------------------
+# 6. IDs de produto
+#---------------------------------------------------
+def _nucleo_ids(texto):
+    ids = pc.utf8_upper(pc.utf8_trim(texto, ESPACOS))
+    ids = pc.if_else(pc.fill_null(pc.equal(ids, ''), False), pa.scalar(None, pa.string()), ids)
+    return ids, pc.invert(pc.string_is_ascii(texto))
+
+@_operacao_arrow(tratar_CSV.padronizar_ids_coluna)
+def padronizar_ids_coluna(serie):
+    """Versão Arrow de `tratar_CSV.padronizar_ids_coluna`."""
+    ids, residuo = _em_paralelo(_nucleo_ids, _para_arrow(serie))
+    resultado = pd.Series(ids.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+    resultado = resultado.mask(resultado.isna(), np.nan)
+    return _completar_residuo(resultado, serie, _mascara(residuo), tratar_CSV.padronizar_ids_coluna).infer_objects()
+
+#---------------------------------------------------
+# 7. Status 'ativo'
+#---------------------------------------------------
+
+# Tokens aceitos e o booleano de cada um, na mesma ordem
+TOKENS_ATIVO = pa.array(list(tratar_CSV.MAPA_ATIVO), type=pa.string())
+VALORES_ATIVO = pa.array(list(tratar_CSV.MAPA_ATIVO.values()), type=pa.bool_())
+
+def _nucleo_ativos(texto):
+    tokens = pc.utf8_lower(pc.utf8_trim(texto, ESPACOS))
+    status = pc.take(VALORES_ATIVO, pc.index_in(tokens, value_set=TOKENS_ATIVO))  # Desconhecidos viram nulo
+    return status, pc.match_substring_regex(texto, REGEX_FORA_LATIN1)
+
+@_operacao_arrow(tratar_CSV.padronizar_ativos_coluna)
+def padronizar_ativos_coluna(serie):
+    """Versão Arrow de `tratar_CSV.padronizar_ativos_coluna`."""
+    status, residuo = _em_paralelo(_nucleo_ativos, _para_arrow(serie))
+    resultado = pd.Series(status.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name, dtype=object)
+    resultado = resultado.mask(resultado.isna(), np.nan)
+    return _completar_residuo(resultado, serie, _mascara(residuo), tratar_CSV.padronizar_ativos_coluna).infer_objects()
+
+
+# Registra o backend; a conversão de moeda já roda em pyarrow.compute e é a mesma nos dois backends
+tratar_CSV.registrar_backend('arrow', {
+    'nome': limpar_nomes_coluna,
+    'email': tratar_emails_coluna,
+    'idade': converter_idades_coluna,
+    'data': converter_datas_coluna,
+    'moeda': tratar_CSV.converter_moeda_coluna,
+    'id_produto': padronizar_ids_coluna,
+    'ativo': padronizar_ativos_coluna,
+})
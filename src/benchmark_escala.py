@@ -0,0 +1,149 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import argparse     # Opções da linha de comando
+import json         # Gravação dos resultados e leitura da baseline
+import os           # Caminhos dos arquivos gerados
+import tempfile     # Pasta temporária para o CSV de saída e o banco SQLite
+import time         # Tempo total de cada tamanho
+from sqlalchemy import create_engine  # Banco SQLite local usado como substituto do SQL Server
+
+from acesso_CSV import load_data, save_cleaned_data
+from conexao_banco import upload_to_database_schema
+from gerar_dados import gerar_csv
+from instrumentacao import RelatorioExecucao
+from tratar_CSV import (
+    clean_names, clean_emails, clean_age, clean_dates, clean_currency,
+    clean_product_ids, clean_active_status, padronizar_cliente_id, remove_duplicates, padronizar_nulos_para_sql
+)
+
+# Tamanhos padrão (em linhas) de cada rodada
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000, 10_000_000]
+
+#---------------------------------------------------
+# Execução do fluxo completo para um arquivo
+#---------------------------------------------------
+def executar_fluxo(csv_path, pasta_saida, memoria=False):
+    """
+    Executa o mesmo fluxo do main.py (carga, limpeza, gravação do CSV e upload, este em SQLite local)
+    medindo cada etapa. Retorna a lista de métricas por etapa e as métricas do fluxo completo.
+    Com memoria=True, mede também o pico de memória (ver RelatorioExecucao).
+    """
+    relatorio = RelatorioExecucao(memoria=memoria)
+    medir = relatorio.medir
+    inicio = time.perf_counter()
+
+    df = medir(load_data, csv_path)
+    for etapa in (clean_names, clean_emails, clean_age, clean_dates, clean_currency,
+                  clean_product_ids, clean_active_status):
+        medir(etapa, df)
+    df = medir(remove_duplicates, df)
+    medir(padronizar_cliente_id, df)
+    df = medir(padronizar_nulos_para_sql, df)
+    medir(save_cleaned_data, df, os.path.join(pasta_saida, 'clientes_limpos.csv'))
+
+    engine = create_engine(f"sqlite:///{os.path.join(pasta_saida, 'benchmark.db')}")
+    medir(upload_to_database_schema, df, engine, None, 'clientes_limpos')
+    engine.dispose()
+
+    duracao = time.perf_counter() - inicio
+    linhas = relatorio.etapas[0]['linhas_saida']
+    fluxo = {
+        'etapa': 'fluxo_completo',
+        'segundos': round(duracao, 6),
+        'linhas_entrada': linhas,
+        'linhas_saida': len(df),
+        'linhas_por_segundo': round(linhas / duracao, 1),
+        'pico_memoria_mb': relatorio.pico_memoria_mb,
+    }
+    return relatorio.etapas + [fluxo]
+
+def medir_tamanho(csv_path, memoria=True):
+    """
+    Mede o fluxo em duas execuções: a primeira só com o tempo (é dela a vazão) e a segunda com a
+    amostragem de memória, cujos picos são copiados para as mesmas etapas. Assim a medição de memória
+    não altera a vazão comparada com a baseline. Com memoria=False, faz apenas a primeira.
+    """
+    with tempfile.TemporaryDirectory() as pasta_saida:
+        etapas = executar_fluxo(csv_path, pasta_saida)
+    if memoria:
+        with tempfile.TemporaryDirectory() as pasta_saida:
+            etapas_memoria = executar_fluxo(csv_path, pasta_saida, memoria=True)
+        for etapa, medida in zip(etapas, etapas_memoria):
+            etapa['pico_memoria_mb'] = medida['pico_memoria_mb']
+            etapa['pico_arrow_mb'] = medida.get('pico_arrow_mb')
+    return etapas
+
+#---------------------------------------------------
+# Comparação com a baseline
+#---------------------------------------------------
+def comparar_baseline(resultados, baseline, tolerancia):
+    """
+    Compara linhas/s e pico de memória de cada (tamanho, etapa) com a baseline.
+    A baseline é específica da máquina: grave uma com --salvar-baseline no mesmo ambiente em que vai comparar.
+    Retorna a lista de regressões (queda de vazão ou aumento de memória acima da `tolerancia`).
+    """
+    regressoes = []
+    for tamanho, etapas in resultados.items():
+        anteriores = {e['etapa']: e for e in baseline.get(tamanho, [])}
+        for etapa in etapas:
+            anterior = anteriores.get(etapa['etapa'])
+            if not anterior or not anterior.get('linhas_por_segundo') or not etapa.get('linhas_por_segundo'):
+                continue
+            vazao = etapa['linhas_por_segundo'] / anterior['linhas_por_segundo']
+            # Picos abaixo de 1 MB variam muito entre execuções e não entram na comparação de memória
+            # (nem os ausentes, de execuções com --sem-memoria)
+            pico, pico_anterior = etapa.get('pico_memoria_mb'), anterior.get('pico_memoria_mb')
+            memoria = pico / pico_anterior if pico is not None and pico_anterior is not None and pico_anterior >= 1 else 1.0
+            if vazao < 1 - tolerancia or memoria > 1 + tolerancia:
+                regressoes.append(f"{tamanho} linhas | {etapa['etapa']}: vazão {vazao:.2f}x, memória {memoria:.2f}x")
+    return regressoes
+
+
+# Uso: python benchmark_escala.py [--tamanhos 10000 100000] [--salvar-baseline] [--baseline arquivo.json]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline em arquivos sintéticos de vários tamanhos.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO)
+    parser.add_argument('--pasta-dados', default=tempfile.gettempdir(),
+                        help="Onde guardar os CSVs sintéticos (reaproveitados entre execuções).")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--baseline', default='baseline_benchmark.json')
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava os resultados como nova baseline.")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Variação aceita antes de acusar regressão.")
+    parser.add_argument('--saida', default='resultado_benchmark.json')
+    parser.add_argument('--sem-memoria', action='store_true',
+                        help="Não faz a segunda execução que mede o pico de memória (só a vazão).")
+    args = parser.parse_args()
+
+    resultados = {}
+    for tamanho in args.tamanhos:
+        csv_path = os.path.join(args.pasta_dados, f"clientes_sinteticos_{tamanho}_{args.semente}.csv")
+        if not os.path.exists(csv_path):
+            gerar_csv(csv_path, tamanho, args.semente)
+
+        resultados[str(tamanho)] = medir_tamanho(csv_path, memoria=not args.sem_memoria)
+
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+
+    print("\n📊 Vazão (linhas/s) e pico de memória por etapa:")
+    for tamanho, etapas in resultados.items():
+        for etapa in etapas:
+            memoria = f"{etapa['pico_memoria_mb']:>9.1f} MB" if etapa['pico_memoria_mb'] is not None else "       --"
+            print(f"   {tamanho:>10} | {etapa['etapa']:<28} {etapa['linhas_por_segundo'] or 0:>14,.0f} | {memoria}")
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+        print(f"✅ Baseline salva em '{args.baseline}'.")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as arquivo:
+            regressoes = comparar_baseline(resultados, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            print("❌ Regressões em relação à baseline:")
+            for regressao in regressoes:
+                print(f"   {regressao}")
+            raise SystemExit(1)
+        print("✅ Nenhuma regressão em relação à baseline.")
+    else:
+        print(f"ℹ️ Baseline '{args.baseline}' não encontrada: use --salvar-baseline para criá-la.")
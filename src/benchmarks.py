@@ -0,0 +1,234 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import os          # Remoção dos bancos SQLite temporários
+import re          # Reprodução da conversão de moeda antiga, para comparação
+import sys          # Leitura de argumentos da linha de comando
+import tempfile     # Pasta temporária para os bancos SQLite de teste
+import time         # Medição do tempo de execução de cada versão
+import pandas as pd # Biblioteca para manipulação de dados em formato de tabelas (DataFrames)
+from sqlalchemy import create_engine  # Banco SQLite local usado como substituto do SQL Server
+
+import tratar_CSV   # Funções de tratamento que serão comparadas
+from conexao_banco import upload_to_database_schema
+from acesso_CSV import load_data, save_cleaned_data, save_cleaned_data_parquet, save_cleaned_data_feather, load_cleaned_data
+
+# Caminho padrão do arquivo de exemplo usado nas medições
+CSV_EXEMPLO = '../data/dados_clientes_sujos_3000_v2.csv'
+
+#---------------------------------------------#
+# Função auxiliar de medição
+#---------------------------------------------#
+def medir(func, *args, repeticoes=3):
+    """Executa `func` algumas vezes e retorna o menor tempo (em segundos) e o último resultado."""
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+#---------------------------------------------#
+# Comparação: leitura sem tipos x leitura com esquema
+#---------------------------------------------#
+def bench_load_data(df):
+    """Compara `pd.read_csv` com inferência de tipos e `load_data` (pyarrow + ESQUEMA_CSV): tempo e memória."""
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'clientes.csv')
+        df.to_csv(caminho, index=False)
+        t_antigo, antigo = medir(pd.read_csv, caminho)
+        t_novo, novo = medir(load_data, caminho)
+
+    mb_antigo = antigo.memory_usage(deep=True).sum() / 1024 ** 2
+    mb_novo = novo.memory_usage(deep=True).sum() / 1024 ** 2
+    linhas = len(df)
+    print(f"load_data | {linhas} linhas | read_csv: {t_antigo:.3f}s, {mb_antigo:,.1f} MB"
+          f" | com esquema: {t_novo:.3f}s, {mb_novo:,.1f} MB | {t_antigo / t_novo:.1f}x, {mb_antigo / mb_novo:.1f}x menos memória")
+
+#---------------------------------------------#
+# Comparação: datas célula a célula x vetorizado
+#---------------------------------------------#
+def bench_clean_dates(df):
+    """Compara `apply(converter_data)` com `converter_datas_coluna` na coluna 'data_compra'."""
+    serie = df['data_compra']
+    t_antigo, antigo = medir(lambda s: s.apply(tratar_CSV.converter_data), serie)
+    t_novo, novo = medir(tratar_CSV.converter_datas_coluna, serie)
+
+    if not antigo.astype('datetime64[ns]').equals(novo):
+        raise AssertionError("Resultados divergentes entre as versões de clean_dates.")
+
+    linhas = len(serie)
+    print(f"clean_dates | {linhas} linhas | apply: {t_antigo:.3f}s ({linhas / t_antigo:,.0f} linhas/s)"
+          f" | vetorizado: {t_novo:.3f}s ({linhas / t_novo:,.0f} linhas/s) | {t_antigo / t_novo:.1f}x")
+
+#---------------------------------------------#
+# Comparação: moeda célula a célula x vetorizada
+#---------------------------------------------#
+def _limpar_moeda_antigo(valor):
+    """Conversão célula a célula usada antes (remove tudo que não é dígito ou vírgula)."""
+    if pd.isnull(valor):
+        return float('nan')
+    return float(re.sub(r'[^\d,]', '', str(valor)).replace(',', '.'))
+
+def bench_clean_currency(df):
+    """Compara o apply antigo com `converter_moeda_coluna` e confere o resultado no arquivo real."""
+    serie = df['valor_compra']
+    t_antigo, _ = medir(lambda s: s.apply(_limpar_moeda_antigo), serie)
+    t_novo, novo = medir(tratar_CSV.converter_moeda_coluna, serie)
+
+    # Nenhum valor preenchido do arquivo de exemplo pode virar NaN
+    if not novo.notna().equals(serie.notna()):
+        raise AssertionError("clean_currency deixou de converter valores preenchidos.")
+    # "R$ 933.6" deve virar 933.6 (e não 9336.0, como na versão antiga)
+    exemplos = tratar_CSV.converter_moeda_coluna(pd.Series(['R$ 933.6', '889,39', '1.234,56', '1,234.56']))
+    if exemplos.tolist() != [933.6, 889.39, 1234.56, 1234.56]:
+        raise AssertionError(f"Conversão de moeda incorreta: {exemplos.tolist()}")
+
+    linhas = len(serie)
+    print(f"clean_currency | {linhas} linhas | apply: {t_antigo:.3f}s ({linhas / t_antigo:,.0f} linhas/s)"
+          f" | vetorizado: {t_novo:.3f}s ({linhas / t_novo:,.0f} linhas/s) | {t_antigo / t_novo:.1f}x")
+
+#---------------------------------------------#
+# Comparação: limpezas de texto célula a célula x vetorizadas
+#---------------------------------------------#
+def bench_clean_texto(df):
+    """Mede linhas/s de cada limpeza de texto com apply, com .str (object) e com .str (Arrow)."""
+    etapas = [
+        ('clean_names', 'nome_cliente', tratar_CSV.limpar_nome, tratar_CSV.limpar_nomes_coluna),
+        ('clean_emails', 'email', tratar_CSV.tratar_email, tratar_CSV.tratar_emails_coluna),
+        ('clean_product_ids', 'produto_id', tratar_CSV.padronizar_id, tratar_CSV.padronizar_ids_coluna),
+        ('clean_active_status', 'ativo', tratar_CSV.padronizar_ativo, tratar_CSV.padronizar_ativos_coluna),
+    ]
+    backend_original = tratar_CSV.BACKEND_TEXTO
+    linhas = len(df)
+    for nome, coluna, por_celula, vetorizada in etapas:
+        serie = df[coluna]
+        t_antigo, antigo = medir(lambda s: s.apply(por_celula), serie)
+        medidas = [f"apply: {linhas / t_antigo:,.0f} linhas/s"]
+
+        for backend in ('object', 'string[pyarrow]'):
+            try:
+                tratar_CSV.BACKEND_TEXTO = backend
+                t_novo, novo = medir(vetorizada, serie)
+            except ImportError:  # pyarrow não instalado
+                continue
+            finally:
+                tratar_CSV.BACKEND_TEXTO = backend_original
+            if not antigo.equals(novo):
+                raise AssertionError(f"Resultados divergentes em {nome} ({backend}).")
+            medidas.append(f"{backend}: {linhas / t_novo:,.0f} linhas/s ({t_antigo / t_novo:.1f}x)")
+
+        print(f"{nome} | {linhas} linhas | " + " | ".join(medidas))
+
+#---------------------------------------------#
+# Comparação: coluna inteira x uma vez por valor distinto
+#---------------------------------------------#
+def bench_por_distintos(df):
+    """Mede cada limpeza por coluna tratando todas as linhas e tratando só os valores distintos."""
+    etapas = [tratar_CSV.clean_names, tratar_CSV.clean_emails, tratar_CSV.clean_age, tratar_CSV.clean_dates,
+              tratar_CSV.clean_currency, tratar_CSV.clean_product_ids, tratar_CSV.clean_active_status]
+    memo = tratar_CSV.MemoDistintos()
+    linhas = len(df)
+    for etapa in etapas:
+        t_coluna, antigo = medir(lambda d: (etapa(d), d)[1], df.copy(), repeticoes=1)
+        t_distintos, novo = medir(lambda d: (etapa(d, memo), d)[1], df.copy(), repeticoes=1)
+        if not antigo.equals(novo):
+            raise AssertionError(f"Resultados divergentes em {etapa.__name__} por valores distintos.")
+        print(f"{etapa.__name__} | {linhas} linhas | coluna inteira: {t_coluna:.3f}s"
+              f" | por distintos: {t_distintos:.3f}s ({t_coluna / t_distintos:.1f}x)")
+    memo.exibir()
+
+#---------------------------------------------#
+# Comparação: backend pandas x backend arrow
+#---------------------------------------------#
+def bench_backends(df):
+    """
+    Compara o tempo de cada operação nos backends 'pandas' e 'arrow'.
+    A conformidade entre os dois (mesmo resultado) é verificada em tests/test_backends.py.
+    """
+    try:
+        tratar_CSV.definir_backend('arrow')
+    except ImportError:  # pyarrow não instalado
+        return
+    finally:
+        tratar_CSV.definir_backend('pandas')
+
+    colunas = {'nome_cliente': 'nome', 'email': 'email', 'idade': 'idade', 'data_compra': 'data',
+               'valor_compra': 'moeda', 'produto_id': 'id_produto', 'ativo': 'ativo'}
+    linhas = len(df)
+    for coluna, nome in colunas.items():
+        pandas_, arrow = tratar_CSV.BACKENDS['pandas'][nome], tratar_CSV.BACKENDS['arrow'][nome]
+        serie = df[coluna]
+        t_pandas, _ = medir(pandas_, serie)
+        t_arrow, _ = medir(arrow, serie)
+        print(f"backend {nome} | {linhas} linhas | pandas: {linhas / t_pandas:,.0f} linhas/s"
+              f" | arrow: {linhas / t_arrow:,.0f} linhas/s ({t_pandas / t_arrow:.1f}x)")
+
+#---------------------------------------------#
+# Comparação: to_sql padrão x carga em lotes
+#---------------------------------------------#
+def bench_upload(df):
+    """Compara o to_sql padrão com `upload_to_database_schema` (lotes + tipos + staging) em um SQLite local."""
+    for etapa in (tratar_CSV.clean_names, tratar_CSV.clean_emails, tratar_CSV.clean_age,
+                  tratar_CSV.clean_dates, tratar_CSV.clean_currency, tratar_CSV.clean_product_ids,
+                  tratar_CSV.clean_active_status, tratar_CSV.padronizar_cliente_id):
+        etapa(df)
+    df = tratar_CSV.padronizar_nulos_para_sql(df)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'bench.db')
+        engine = create_engine(f"sqlite:///{caminho}")
+
+        t_antigo, _ = medir(lambda d: d.to_sql('clientes', engine, if_exists='replace', index=False), df, repeticoes=1)
+        t_novo, _ = medir(lambda d: upload_to_database_schema(d, engine, None, 'clientes', usar_staging=True),
+                          df, repeticoes=1)
+        engine.dispose()
+
+    linhas = len(df)
+    print(f"upload | {linhas} linhas | to_sql: {t_antigo:.3f}s ({linhas / t_antigo:,.0f} linhas/s)"
+          f" | em lotes + staging: {t_novo:.3f}s ({linhas / t_novo:,.0f} linhas/s)")
+
+#---------------------------------------------#
+# Comparação: CSV x Parquet x Feather
+#---------------------------------------------#
+def bench_formatos(df):
+    """Compara tamanho em disco e tempo de leitura dos dados tratados em CSV, Parquet e Feather."""
+    for etapa in (tratar_CSV.clean_names, tratar_CSV.clean_emails, tratar_CSV.clean_age,
+                  tratar_CSV.clean_dates, tratar_CSV.clean_currency, tratar_CSV.clean_product_ids,
+                  tratar_CSV.clean_active_status, tratar_CSV.padronizar_cliente_id):
+        etapa(df)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        formatos = [
+            ('csv', lambda c: save_cleaned_data(df, c), lambda c: pd.read_csv(c)),
+            ('parquet', lambda c: save_cleaned_data_parquet(df, c), load_cleaned_data),
+            ('feather', lambda c: save_cleaned_data_feather(df, c), load_cleaned_data),
+            ('arrow', lambda c: save_cleaned_data_feather(df, c, compressao='uncompressed'), load_cleaned_data),
+        ]
+        for extensao, salvar, carregar in formatos:
+            caminho = os.path.join(pasta, f"clientes.{extensao}")
+            salvar(caminho)
+            t_leitura, _ = medir(carregar, caminho)
+            t_coluna, _ = medir(lambda c: pd.read_csv(c, usecols=['valor_compra']) if extensao == 'csv'
+                                else load_cleaned_data(c, colunas=['valor_compra']), caminho)
+            print(f"formato {extensao} | {os.path.getsize(caminho) / 1024:,.0f} KB"
+                  f" | leitura: {t_leitura:.3f}s | só 'valor_compra': {t_coluna:.3f}s")
+
+
+# Executa as medições quando o script é rodado diretamente:
+#   python benchmarks.py [caminho_csv] [fator_de_repeticao]
+if __name__ == "__main__":
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CSV_EXEMPLO
+    fator = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    # Replica o arquivo de exemplo para obter um volume em que a diferença seja visível
+    df = pd.concat([pd.read_csv(caminho)] * fator, ignore_index=True)
+
+    bench_load_data(df)
+    bench_clean_dates(df)
+    bench_clean_currency(df)
+    bench_clean_texto(df)
+    bench_por_distintos(df)
+    bench_backends(df)
+    bench_upload(df.copy())
+    bench_formatos(df.copy())
@@ -0,0 +1,142 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import hashlib      # Hash do conteúdo do arquivo de entrada e das regras de limpeza
+import json         # Metadados do cache (tamanho, último acesso) e último envio por destino
+import os           # Manipulação de arquivos e pastas do cache
+import shutil       # Remoção da pasta inteira ao limpar o cache
+import time         # Horário do último acesso, usado na política LRU
+import pandas as pd # Leitura e gravação dos resultados em Parquet
+
+import tratar_CSV   # Localiza a pasta dos módulos cujo código faz parte da chave do cache
+
+# Nome do arquivo de metadados dentro da pasta do cache
+ARQUIVO_METADADOS = 'metadados.json'
+
+# Arquivo com a última chave enviada a cada destino ({'schema.tabela': chave})
+ARQUIVO_ENVIOS = 'enviados.json'
+
+# Módulos cujo código muda o resultado tratado: leitura e esquema (acesso_CSV), regras de limpeza
+# (tratar_CSV e backend_arrow), pipeline declarativo (especificacao) e ordem das etapas (pipeline)
+MODULOS_REGRAS = ['acesso_CSV.py', 'tratar_CSV.py', 'backend_arrow.py', 'especificacao.py', 'pipeline.py']
+
+#---------------------------------------------------
+# Cálculo da chave do cache
+#---------------------------------------------------
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """Calcula o SHA-256 do conteúdo do arquivo lendo em blocos (sem carregá-lo inteiro na memória)."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def versao_regras():
+    """Versão das regras de limpeza: hash do código de MODULOS_REGRAS (qualquer alteração invalida o cache)."""
+    pasta = os.path.dirname(os.path.abspath(tratar_CSV.__file__))
+    partes = [f"{nome}:{hash_arquivo(os.path.join(pasta, nome))}" for nome in MODULOS_REGRAS
+              if os.path.exists(os.path.join(pasta, nome))]
+    return hashlib.sha256('|'.join(partes).encode()).hexdigest()[:16]
+
+def chave_cache(csv_path, modo=''):
+    """Chave do resultado tratado: conteúdo do CSV + versão das regras + opções que mudam o resultado."""
+    partes = f"{hash_arquivo(csv_path)}|{versao_regras()}|{modo}"
+    return hashlib.sha256(partes.encode()).hexdigest()[:32]
+
+#---------------------------------------------------
+# Metadados do cache
+#---------------------------------------------------
+def _carregar_metadados(pasta_cache):
+    caminho = os.path.join(pasta_cache, ARQUIVO_METADADOS)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def _salvar_metadados(pasta_cache, metadados):
+    with open(os.path.join(pasta_cache, ARQUIVO_METADADOS), 'w', encoding='utf-8') as arquivo:
+        json.dump(metadados, arquivo, indent=2)
+
+#---------------------------------------------------
+# Leitura e gravação de resultados
+#---------------------------------------------------
+def ler_cache(pasta_cache, chave):
+    """Retorna o DataFrame tratado guardado para a chave, ou None se não houver."""
+    metadados = _carregar_metadados(pasta_cache)
+    caminho = os.path.join(pasta_cache, f"{chave}.parquet")
+    if chave not in metadados or not os.path.exists(caminho):
+        return None
+
+    df = pd.read_parquet(caminho)
+    metadados[chave]['ultimo_acesso'] = time.time()  # Atualiza a posição na fila LRU
+    _salvar_metadados(pasta_cache, metadados)
+    print(f"✅ Resultado tratado encontrado no cache ({len(df)} linhas): leitura e limpeza ignoradas.")
+    return df
+
+def salvar_cache(df, pasta_cache, chave, limite_mb=500):
+    """Guarda o DataFrame tratado em Parquet e remove os itens menos usados se passar de `limite_mb`."""
+    os.makedirs(pasta_cache, exist_ok=True)
+    caminho = os.path.join(pasta_cache, f"{chave}.parquet")
+    df.to_parquet(caminho, index=False)
+
+    metadados = _carregar_metadados(pasta_cache)
+    metadados[chave] = {'tamanho': os.path.getsize(caminho), 'ultimo_acesso': time.time()}
+    _salvar_metadados(pasta_cache, _aplicar_lru(pasta_cache, metadados, limite_mb * 1024 * 1024, manter=chave))
+    print("✅ Resultado tratado salvo no cache.")
+
+def _aplicar_lru(pasta_cache, metadados, limite_bytes, manter=None):
+    """Remove os itens acessados há mais tempo até o total caber no limite (nunca remove `manter`)."""
+    total = sum(item['tamanho'] for item in metadados.values())
+    for chave in sorted(metadados, key=lambda c: metadados[c]['ultimo_acesso']):
+        if total <= limite_bytes:
+            break
+        if chave == manter:  # O item recém-gravado fica, mesmo que sozinho passe do limite
+            continue
+        total -= metadados[chave]['tamanho']
+        caminho = os.path.join(pasta_cache, f"{chave}.parquet")
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        del metadados[chave]
+        print(f"ℹ️ Item '{chave}' removido do cache (limite de tamanho).")
+    return metadados
+
+#---------------------------------------------------
+# Controle dos destinos que já receberam o resultado
+#---------------------------------------------------
+# Cada destino guarda só a última chave enviada: o upload substitui a tabela inteira, então
+# enviar outro resultado (ou um sem chave, feito sem cache) invalida o envio anterior.
+def _carregar_envios(pasta_cache):
+    caminho = os.path.join(pasta_cache, ARQUIVO_ENVIOS)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def ja_enviado(pasta_cache, chave, destino):
+    """Indica se o resultado dessa chave foi o último enviado ao destino (ex: 'schema.tabela')."""
+    return chave is not None and _carregar_envios(pasta_cache).get(destino) == chave
+
+def marcar_enviado(pasta_cache, chave, destino):
+    """
+    Registra que o resultado dessa chave é o último enviado ao destino. Chame também depois de
+    qualquer outra escrita no destino, com chave=None, para que nenhuma chave seja dada como enviada.
+    """
+    envios = _carregar_envios(pasta_cache)
+    if envios.get(destino) == chave:
+        return
+    if chave is None:
+        del envios[destino]
+    else:
+        envios[destino] = chave
+    os.makedirs(pasta_cache, exist_ok=True)
+    with open(os.path.join(pasta_cache, ARQUIVO_ENVIOS), 'w', encoding='utf-8') as arquivo:
+        json.dump(envios, arquivo, indent=2)
+
+#---------------------------------------------------
+# Limpeza do cache
+#---------------------------------------------------
+def limpar_cache(pasta_cache):
+    """Apaga todos os resultados guardados."""
+    if os.path.isdir(pasta_cache):
+        shutil.rmtree(pasta_cache)
+    print(f"✅ Cache em '{pasta_cache}' apagado.")
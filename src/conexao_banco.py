@@ -1,30 +1,138 @@
 #-------------------------------------------
 # Bibliotecas necessárias
 #-------------------------------------------
-from azure.identity import DefaultAzureCredential # Faz autenticação automática com a Azure (ex: identidade gerenciada, login local etc)
-from azure.keyvault.secrets import SecretClient   # Cliente para acessar segredos (como senhas) no Azure Key Vault
+# As bibliotecas da Azure são importadas em ProvedorKeyVault, para que o ProvedorLocal funcione sem elas
+import hashlib                                    # Impressão digital dos dados no checkpoint do upload particionado
+import json                                       # Leitura do arquivo de segredos locais e do checkpoint
+import os                                         # Leitura dos segredos a partir de variáveis de ambiente
+import threading                                  # Trava que protege os caches compartilhados entre threads
+import time                                       # Controle do tempo de validade (TTL) dos segredos
+from concurrent.futures import ThreadPoolExecutor # Busca dos segredos em paralelo
 from sqlalchemy import create_engine, text        # create_engine cria conexão com banco de dados / text permite comandos SQL seguros
+from sqlalchemy import inspect                    # Consulta a estrutura do banco (ex: se uma tabela já existe)
+from sqlalchemy import types as sqltypes          # Tipos SQL explícitos para as colunas (evita que o pandas "adivinhe")
 import pandas as pd                               # Biblioteca para manipulação de dados em tabelas (DataFrames)
 import urllib                                     # Usada para codificar strings de conexão (ex: substituir caracteres especiais por códigos URL)
 
 #---------------------------------------------------
-# Conexão com o banco usando Azure Key Vault
+# Provedores de segredos
+#---------------------------------------------------
+
+# Segredos necessários para montar a conexão com o banco
+SEGREDOS_BANCO = ("db-academy-database", "db-academy-server")
+
+# Tempo (em segundos) que um segredo lido continua válido no cache antes de ser buscado de novo
+TTL_SEGREDOS = 3600
+
+class ProvedorKeyVault:
+    """Lê os segredos do Azure Key Vault. A credencial e o cliente são criados uma única vez por instância."""
+
+    def __init__(self, vault_url):
+        from azure.identity import DefaultAzureCredential # Faz autenticação automática com a Azure (ex: identidade gerenciada, login local etc)
+        from azure.keyvault.secrets import SecretClient   # Cliente para acessar segredos (como senhas) no Azure Key Vault
+
+        self.chave = vault_url  # Identifica o provedor no cache de segredos
+        self.client = SecretClient(vault_url=vault_url, credential=DefaultAzureCredential())
+
+    def obter(self, nome):
+        return self.client.get_secret(nome).value
+
+class ProvedorLocal:
+    """
+    Substituto local do Key Vault, para testes e desenvolvimento.
+    Cada segredo é procurado primeiro em uma variável de ambiente com o nome em maiúsculas e
+    '_' no lugar de '-' (ex: DB_ACADEMY_SERVER) e depois no arquivo JSON informado, se houver.
+    """
+
+    def __init__(self, arquivo=None):
+        self.chave = f"local:{arquivo}"
+        self.valores = {}
+        if arquivo:
+            with open(arquivo, encoding="utf-8") as f:
+                self.valores = json.load(f)
+
+    def obter(self, nome):
+        variavel = nome.upper().replace("-", "_")
+        if variavel in os.environ:
+            return os.environ[variavel]
+        if nome in self.valores:
+            return self.valores[nome]
+        raise KeyError(f"Segredo '{nome}' não encontrado na variável {variavel} nem no arquivo de segredos.")
+
+# Caches compartilhados pelo processo inteiro (chamadas repetidas e workers de upload)
+_trava = threading.Lock()
+_provedores = {}      # vault_url -> ProvedorKeyVault (evita autenticar de novo a cada chamada)
+_segredos = {}        # (chave do provedor, nome do segredo) -> (valor, instante em que expira)
+_engines = {}         # URL de conexão -> engine com pool
+
+def obter_segredos(provedor, nomes=SEGREDOS_BANCO, ttl=TTL_SEGREDOS):
+    """
+    Retorna um dicionário {nome: valor} com os segredos pedidos.
+    Os que ainda estão válidos no cache não são buscados; os demais são buscados em paralelo.
+    """
+    agora = time.monotonic()
+    with _trava:
+        valores = {nome: _segredos[(provedor.chave, nome)][0] for nome in nomes
+                   if (provedor.chave, nome) in _segredos and _segredos[(provedor.chave, nome)][1] > agora}
+
+    faltando = [nome for nome in nomes if nome not in valores]
+    if faltando:
+        # Cada segredo é uma chamada de rede independente: buscá-los juntos paga a latência uma vez só
+        with ThreadPoolExecutor(max_workers=len(faltando)) as executor:
+            buscados = dict(zip(faltando, executor.map(provedor.obter, faltando)))
+        with _trava:
+            for nome, valor in buscados.items():
+                _segredos[(provedor.chave, nome)] = (valor, agora + ttl)
+        valores.update(buscados)
+    return valores
+
+#---------------------------------------------------
+# Engine compartilhado pelo processo
 #---------------------------------------------------
-def connect_to_database_schema(vault_url):
+def obter_engine(url, pool_size=5, max_overflow=10, pool_pre_ping=True, **opcoes):
     """
-    Conecta ao banco de dados SQL Server usando segredos do Key Vault.
-    Retorna um SQLAlchemy engine.
+    Retorna o engine do processo para a URL informada, criando-o na primeira chamada.
+    O pool mantém até `pool_size` conexões abertas (mais `max_overflow` temporárias), e
+    `pool_pre_ping` testa cada conexão antes de reutilizá-la, descartando as que o servidor já fechou.
     """
-    credential = DefaultAzureCredential()
-    client = SecretClient(vault_url=vault_url, credential=credential)
+    with _trava:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, pool_size=pool_size, max_overflow=max_overflow,
+                                   pool_pre_ping=pool_pre_ping, **opcoes)
+            _engines[url] = engine
+    return engine
 
-    # Recupera os segredos
-    secret_database = client.get_secret("db-academy-database").value
-    secret_server = client.get_secret("db-academy-server").value
+def fechar_conexoes():
+    """Fecha as conexões de todos os engines e esvazia os caches de engines e de segredos."""
+    with _trava:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _segredos.clear()
+        _provedores.clear()
+
+#---------------------------------------------------
+# Conexão com o banco usando Azure Key Vault
+#---------------------------------------------------
+def connect_to_database_schema(vault_url, provedor=None, pool_size=5, max_overflow=10, pool_pre_ping=True):
+    """
+    Conecta ao banco de dados SQL Server usando segredos do Key Vault (ou do `provedor` informado).
+    Retorna o SQLAlchemy engine compartilhado: chamadas repetidas reutilizam os segredos em cache
+    e as conexões do pool, sem autenticar de novo.
+    """
+    if provedor is None:
+        with _trava:
+            if vault_url not in _provedores:
+                _provedores[vault_url] = ProvedorKeyVault(vault_url)
+            provedor = _provedores[vault_url]
 
+    # Recupera os segredos (em paralelo, ou do cache enquanto estiverem válidos)
+    segredos = obter_segredos(provedor)
+    secret_database = segredos["db-academy-database"]
+    secret_server = segredos["db-academy-server"]
 
-    # Monta a connection string com urllib para encoding
-     # Monta a connection string com urllib para encoding correto
+    # Monta a connection string com urllib para encoding correto
     params = urllib.parse.quote_plus(
         f"DRIVER={{ODBC Driver 17 for SQL Server}};"
         f"SERVER={secret_server};"
@@ -34,8 +142,9 @@ def connect_to_database_schema(vault_url):
         f"TrustServerCertificate=no;"
     )
 
-    # Cria engine
-    engine = create_engine(f"mssql+pyodbc:///?odbc_connect={params}")
+    # Engine com pool (fast_executemany faz o pyodbc enviar cada lote de INSERTs de uma só vez)
+    engine = obter_engine(f"mssql+pyodbc:///?odbc_connect={params}", pool_size=pool_size,
+                          max_overflow=max_overflow, pool_pre_ping=pool_pre_ping, fast_executemany=True)
     print("✅ Conexão com o banco de dados estabelecida.")
     return engine
 
@@ -72,25 +181,244 @@ def create_schema(engine, schema_name):
             raise  # Repassa o erro para possível tratamento externo
 
 
+#---------------------------------------------------
+# Tipos SQL derivados dos dtypes já tratados
+#---------------------------------------------------
+
+# Colunas de texto com tamanho conhecido (o cliente_id é sempre um UUID de 36 caracteres). As demais são
+# criadas como NVARCHAR(MAX): a tabela recebe mais linhas depois (streaming, upsert, ingestão), e um tamanho
+# calculado só com o primeiro lote faria o SQL Server recusar valores maiores ("would be truncated").
+COMPRIMENTOS_TEXTO = {'cliente_id': 36}
+
+def tipos_sql_do_dataframe(df, comprimentos=COMPRIMENTOS_TEXTO):
+    """
+    Monta o dicionário {coluna: tipo SQLAlchemy} a partir dos dtypes do DataFrame tratado,
+    para que o to_sql não precise inferir os tipos nem crie tudo como texto.
+    O tamanho das colunas de texto vem de `comprimentos`, nunca dos dados do lote atual.
+    """
+    tipos = {}
+    for col in df.columns:
+        # infer_dtype olha os valores reais, o que cobre colunas 'object' com booleanos ou datas
+        inferido = pd.api.types.infer_dtype(df[col], skipna=True)
+
+        if inferido == 'integer' or pd.api.types.is_integer_dtype(df[col]):
+            tipos[col] = sqltypes.Integer()
+        elif inferido in ('floating', 'mixed-integer-float', 'decimal') or pd.api.types.is_float_dtype(df[col]):
+            tipos[col] = sqltypes.Float()
+        elif inferido == 'boolean':
+            tipos[col] = sqltypes.Boolean()
+        elif inferido in ('datetime64', 'datetime', 'date'):
+            tipos[col] = sqltypes.DateTime()
+        else:
+            tipos[col] = sqltypes.Unicode(length=comprimentos.get(col))  # Sem tamanho: NVARCHAR(MAX)
+    return tipos
+
+#---------------------------------------------------
+# Troca da tabela de staging pela tabela final
+#---------------------------------------------------
+def trocar_tabela_staging(engine, schema_name, staging_name, table_name, descartar=()):
+    """
+    Substitui a tabela final pela tabela de staging em uma única transação,
+    para que os leitores nunca vejam uma tabela carregada pela metade.
+    As tabelas auxiliares em `descartar` (nomes completos) são apagadas na mesma transação.
+    """
+    with engine.begin() as conn:  # begin() faz commit ao final ou rollback em caso de erro
+        if engine.dialect.name == 'sqlite':
+            # O driver sqlite3 só abre a transação antes de INSERT/UPDATE/DELETE: sem este BEGIN,
+            # o DROP TABLE seria confirmado na hora e uma falha no RENAME deixaria o banco sem a tabela
+            conn.exec_driver_sql("BEGIN")
+        if engine.dialect.name == 'mssql':
+            conn.execute(text(f"DROP TABLE IF EXISTS {schema_name}.{table_name}"))
+            conn.execute(text("EXEC sp_rename :origem, :destino"),
+                         {"origem": f"{schema_name}.{staging_name}", "destino": table_name})
+        else:
+            # Outros bancos (ex: SQLite usado em testes locais) aceitam ALTER TABLE ... RENAME TO
+            prefixo = f"{schema_name}." if schema_name else ""
+            conn.execute(text(f"DROP TABLE IF EXISTS {prefixo}{table_name}"))
+            conn.execute(text(f"ALTER TABLE {prefixo}{staging_name} RENAME TO {table_name}"))
+        for tabela in descartar:
+            conn.execute(text(f"DROP TABLE IF EXISTS {tabela}"))
+
 #---------------------------------------------------
 # Upload de dados para o banco dentro do schema
 #---------------------------------------------------
-def upload_to_database_schema(df, engine, schema_name, table_name):
+def upload_to_database_schema(df, engine, schema_name, table_name, if_exists='replace',
+                              batch_size=10_000, usar_staging=False):
     """
     Envia os dados para o banco, criando a tabela no schema especificado.
+    Use if_exists='append' para acrescentar blocos a uma tabela já criada (modo streaming).
+    Os INSERTs são enviados em lotes de `batch_size` linhas com tipos SQL explícitos.
+    Com usar_staging=True, os dados vão para '<tabela>_staging' e só depois substituem a tabela final.
     """
+    destino = f"{table_name}_staging" if usar_staging else table_name
     try:
         # Envia o DataFrame para o banco de dados usando o método to_sql
         df.to_sql(
-            name=table_name,          # Nome da tabela que será criada ou substituída
+            name=destino,             # Nome da tabela que será criada ou substituída
             con=engine,               # Conexão com o banco de dados (SQLAlchemy engine)
             schema=schema_name,       # Nome do schema onde a tabela será criada
-            if_exists='replace',      # Substitui a tabela se ela já existir
-            index=False               # Não envia o índice do DataFrame como coluna
+            if_exists='replace' if usar_staging else if_exists,  # A staging é sempre recriada do zero
+            index=False,              # Não envia o índice do DataFrame como coluna
+            dtype=tipos_sql_do_dataframe(df),  # Tipos definidos a partir dos dados tratados
+            chunksize=batch_size      # Quantidade de linhas por lote de INSERT (executemany)
         )
+
+        if usar_staging:
+            trocar_tabela_staging(engine, schema_name, destino, table_name)
+
         # Mensagem de sucesso ao concluir o envio
         print(f"✅ Dados enviados com sucesso para '{schema_name}.{table_name}'.")
     except Exception as e:
         # Em caso de erro, imprime a mensagem com detalhes
         print(f"❌ Erro ao enviar os dados para '{schema_name}.{table_name}': {e}")
         raise  # Relança o erro para tratamento externo, se necessário
+
+
+#---------------------------------------------------
+# Upload particionado, paralelo e retomável
+#---------------------------------------------------
+
+# Lê o checkpoint, se existir e se for da mesma carga (mesmo destino, mesmos dados e mesmas partições)
+def _ler_checkpoint(caminho, identificacao):
+    if not caminho or not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    return checkpoint if checkpoint.get("identificacao") == identificacao else None
+
+# Grava o checkpoint em um arquivo temporário e o renomeia, para nunca deixar um JSON pela metade
+def _salvar_checkpoint(caminho, checkpoint):
+    if not caminho:
+        return
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(temporario, caminho)
+
+def upload_particionado(df, engine, schema_name, table_name, tamanho_particao=50_000, workers=4,
+                        tentativas=3, espera=1.0, checkpoint_path=None, batch_size=10_000):
+    """
+    Envia `df` em partições de `tamanho_particao` linhas, em paralelo (`workers` threads, cada uma
+    com uma conexão do pool do engine), para '<tabela>_staging'. A staging só substitui a tabela
+    final depois que todas as partições foram gravadas.
+
+    Cada partição é gravada em uma transação própria. Se falhar, só ela é repetida, até `tentativas`
+    vezes, com espera exponencial (`espera`, 2 * `espera`, ...). A mesma transação registra a partição
+    em '<tabela>_staging_particoes': linhas e registro são confirmados juntos, então uma queda nunca
+    deixa uma partição gravada sem registro (que seria enviada de novo, duplicando as linhas).
+    `checkpoint_path` identifica a carga (destino, dados e partições). Se ela for interrompida, a próxima
+    chamada com os mesmos dados e destino retoma da staging existente e envia só as partições que faltam.
+    A troca da staging pela tabela final apaga o controle na mesma transação: se a queda foi depois
+    dela (staging e controle já não existem), a carga é dada como concluída e não é refeita.
+    """
+    staging_name = f"{table_name}_staging"
+    prefixo = f"{schema_name}." if schema_name else ""
+    controle = f"{prefixo}{staging_name}_particoes"  # Partições já confirmadas na staging
+    total = (len(df) + tamanho_particao - 1) // tamanho_particao
+    tipos = tipos_sql_do_dataframe(df)  # Calculados uma vez, sobre o DataFrame inteiro
+
+    # Identifica a carga: o checkpoint só vale para o mesmo destino, os mesmos dados e as mesmas partições
+    digital = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+    identificacao = f"{schema_name}.{staging_name}|{len(df)}|{tamanho_particao}|{digital}"
+
+    checkpoint = _ler_checkpoint(checkpoint_path, identificacao)
+    existentes = {tabela for tabela in (staging_name, f"{staging_name}_particoes")
+                  if inspect(engine).has_table(tabela, schema=schema_name)}
+    if checkpoint is not None and not existentes:
+        # A troca já foi confirmada; só a remoção do checkpoint ficou para trás
+        os.remove(checkpoint_path)
+        print(f"ℹ️ Upload para '{schema_name}.{table_name}' já concluído antes da interrupção.")
+        return
+    if checkpoint is None or len(existentes) < 2:
+        # Carga nova: staging recriada vazia, já com os tipos SQL explícitos, e controle de partições zerado
+        df.head(0).to_sql(staging_name, engine, schema=schema_name, if_exists='replace', index=False, dtype=tipos)
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {controle}"))
+            conn.execute(text(f"CREATE TABLE {controle} (particao INTEGER NOT NULL PRIMARY KEY)"))
+        _salvar_checkpoint(checkpoint_path, {"identificacao": identificacao})
+        concluidas = set()
+    else:
+        with engine.connect() as conn:
+            concluidas = {linha[0] for linha in conn.execute(text(f"SELECT particao FROM {controle}"))}
+        print(f"ℹ️ Retomando upload: {len(concluidas)} de {total} partições já enviadas.")
+
+    def enviar(numero):
+        parte = df.iloc[numero * tamanho_particao:(numero + 1) * tamanho_particao]
+        for tentativa in range(1, tentativas + 1):
+            try:
+                with engine.begin() as conn:  # Commit só com a partição inteira gravada e registrada
+                    parte.to_sql(staging_name, conn, schema=schema_name, if_exists='append', index=False,
+                                 dtype=tipos, chunksize=batch_size)
+                    # A chave primária também impede que a mesma partição seja confirmada duas vezes
+                    conn.execute(text(f"INSERT INTO {controle} (particao) VALUES (:particao)"), {"particao": numero})
+                break
+            except Exception as e:
+                if tentativa == tentativas:
+                    raise
+                print(f"⚠️ Partição {numero} falhou (tentativa {tentativa} de {tentativas}): {e}")
+                time.sleep(espera * 2 ** (tentativa - 1))
+
+    pendentes = [numero for numero in range(total) if numero not in concluidas]
+    falhas = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futuros = {executor.submit(enviar, numero): numero for numero in pendentes}
+        for futuro, numero in futuros.items():
+            if futuro.exception() is not None:
+                falhas[numero] = futuro.exception()
+
+    if falhas:
+        print(f"❌ {len(falhas)} de {total} partições falharam; execute de novo para retomar do checkpoint.")
+        raise next(iter(falhas.values()))
+
+    trocar_tabela_staging(engine, schema_name, staging_name, table_name, descartar=[controle])
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # Carga concluída: o próximo upload começa do zero
+    print(f"✅ {len(df)} linhas enviadas em {total} partições para '{schema_name}.{table_name}'.")
+
+
+#---------------------------------------------------
+# Upsert (MERGE) de linhas novas ou alteradas
+#---------------------------------------------------
+def upsert_to_database_schema(df, engine, schema_name, table_name, chave='cliente_id'):
+    """
+    Insere ou atualiza no banco apenas as linhas de `df`, usando a coluna `chave` para casar
+    com as linhas já existentes. As linhas vão primeiro para '<tabela>_delta' e são aplicadas
+    na tabela final em uma única transação (MERGE no SQL Server; DELETE + INSERT nos demais bancos).
+    """
+    if df.empty:
+        print(f"ℹ️ Nenhuma linha nova ou alterada para '{schema_name}.{table_name}'.")
+        return
+
+    # Primeira carga: a tabela ainda não existe, então é criada diretamente
+    if not inspect(engine).has_table(table_name, schema=schema_name):
+        upload_to_database_schema(df, engine, schema_name, table_name)
+        return
+
+    delta_name = f"{table_name}_delta"
+    upload_to_database_schema(df, engine, schema_name, delta_name)
+
+    prefixo = f"{schema_name}." if schema_name else ""
+    destino, origem = f"{prefixo}{table_name}", f"{prefixo}{delta_name}"
+    colunas = ", ".join(df.columns)
+
+    try:
+        with engine.begin() as conn:  # begin() faz commit ao final ou rollback em caso de erro
+            if engine.dialect.name == 'mssql':
+                atualizacoes = ", ".join(f"destino.{col} = origem.{col}" for col in df.columns if col != chave)
+                valores = ", ".join(f"origem.{col}" for col in df.columns)
+                conn.execute(text(f"""
+                    MERGE {destino} AS destino
+                    USING {origem} AS origem
+                    ON destino.{chave} = origem.{chave}
+                    WHEN MATCHED THEN UPDATE SET {atualizacoes}
+                    WHEN NOT MATCHED THEN INSERT ({colunas}) VALUES ({valores});
+                """))
+            else:
+                conn.execute(text(f"DELETE FROM {destino} WHERE {chave} IN (SELECT {chave} FROM {origem})"))
+                conn.execute(text(f"INSERT INTO {destino} ({colunas}) SELECT {colunas} FROM {origem}"))
+            conn.execute(text(f"DROP TABLE {origem}"))
+
+        print(f"✅ {len(df)} linhas novas ou alteradas aplicadas em '{schema_name}.{table_name}'.")
+    except Exception as e:
+        print(f"❌ Erro no upsert em '{schema_name}.{table_name}': {e}")
+        raise
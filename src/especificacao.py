@@ -0,0 +1,131 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import json         # Leitura de especificações em JSON
+import os           # Identifica o formato do arquivo da especificação pela extensão
+import pandas as pd # Montagem do DataFrame tratado
+
+# Funções de tratamento por coluna e etapas globais (duplicatas e cliente_id)
+from tratar_CSV import padronizar_nulos_coluna, aplicar_por_distintos, operacao, BACKENDS, COLUNAS_DUPLICATAS
+
+#---------------------------------------------------
+# Operações e tipos disponíveis na especificação
+#---------------------------------------------------
+
+# Nomes das operações aceitas na especificação (cada uma executada pelo backend escolhido em tratar_CSV)
+OPERACOES = sorted(BACKENDS['pandas'])
+
+# Nome usado na especificação -> dtype final da coluna
+TIPOS = {
+    'texto': object,
+    'inteiro': 'Int64',
+    'decimal': 'float64',
+    'data': 'datetime64[ns]',
+    'booleano': 'boolean',
+}
+
+# Especificação dos dados de clientes: o mesmo resultado das etapas chamadas uma a uma em main.py.
+# Cada coluna de saída informa de qual coluna do CSV vem ('origem', padrão: o mesmo nome), com que
+# dtype é lida ('leitura'), as operações aplicadas em sequência e, opcionalmente, o tipo final ('tipo').
+ESPECIFICACAO_CLIENTES = {
+    'colunas': {
+        'nome_cliente': {'leitura': 'string[pyarrow]', 'operacoes': ['nome']},
+        'email': {'leitura': 'string[pyarrow]', 'operacoes': ['email']},
+        'idade': {'leitura': 'string[pyarrow]', 'operacoes': ['idade'], 'tipo': 'inteiro'},
+        'data_compra': {'leitura': 'string[pyarrow]', 'operacoes': ['data'], 'tipo': 'data'},
+        'valor_compra': {'leitura': 'string[pyarrow]', 'operacoes': ['moeda'], 'tipo': 'decimal'},
+        'produto_id': {'leitura': 'category', 'operacoes': ['id_produto']},
+        'ativo': {'leitura': 'category', 'operacoes': ['ativo']},
+    },
+    'duplicatas': {'colunas': COLUNAS_DUPLICATAS, 'normalizar': False},  # None desativa a etapa
+    'cliente_id': {'deterministico': False},                             # None desativa a etapa
+}
+
+#---------------------------------------------------
+# Leitura e validação da especificação
+#---------------------------------------------------
+def validar_especificacao(especificacao):
+    """Confere operações e tipos antes de ler qualquer dado, para o erro aparecer logo no início."""
+    for destino, coluna in especificacao['colunas'].items():
+        desconhecidas = [op for op in coluna.get('operacoes', []) if op not in OPERACOES]
+        if desconhecidas:
+            raise ValueError(f"Coluna '{destino}': operações desconhecidas {desconhecidas}. "
+                             f"Disponíveis: {OPERACOES}.")
+        if coluna.get('tipo') is not None and coluna['tipo'] not in TIPOS:
+            raise ValueError(f"Coluna '{destino}': tipo '{coluna['tipo']}' desconhecido. Disponíveis: {sorted(TIPOS)}.")
+    return especificacao
+
+def carregar_especificacao(caminho):
+    """Lê uma especificação em JSON ou YAML (o YAML exige o pacote PyYAML)."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        if os.path.splitext(caminho)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml  # Importado só aqui: o PyYAML só é necessário para especificações em YAML
+            except ImportError as e:
+                raise ImportError(f"A especificação '{caminho}' é YAML e exige o pacote PyYAML "
+                                  "(pip install -r requirements.txt), ou use uma especificação em JSON.") from e
+            especificacao = yaml.safe_load(arquivo)
+        else:
+            especificacao = json.load(arquivo)
+    return validar_especificacao(especificacao)
+
+#---------------------------------------------------
+# Planejamento da execução
+#---------------------------------------------------
+def esquema_leitura(especificacao, colunas_arquivo):
+    """Esquema {coluna do CSV: dtype} só com as colunas da especificação que existem no arquivo."""
+    esquema = {}
+    for destino, coluna in especificacao['colunas'].items():
+        origem = coluna.get('origem', destino)
+        if origem in colunas_arquivo:
+            esquema[origem] = coluna.get('leitura', 'string[pyarrow]')
+    if not esquema:
+        raise ValueError("Nenhuma coluna da especificação existe no arquivo de entrada.")
+    return esquema
+
+def planejar(especificacao, colunas_disponiveis):
+    """
+    Retorna a lista de etapas (destino, origem, operações, tipo) das colunas presentes nos dados.
+    Colunas da especificação que não existem na fonte são ignoradas, com um aviso.
+    """
+    plano = []
+    for destino, coluna in especificacao['colunas'].items():
+        origem = coluna.get('origem', destino)
+        if origem not in colunas_disponiveis:
+            print(f"ℹ️ Coluna '{origem}' ausente na fonte: etapas de '{destino}' ignoradas.")
+            continue
+        plano.append((destino, origem, tuple(coluna.get('operacoes', [])), coluna.get('tipo')))
+    return plano
+
+# Junta as operações de uma coluna em uma única função, aplicada de uma vez à coluna (ou aos seus valores distintos)
+def _fundir(operacoes):
+    def executar(serie):
+        for nome in operacoes:
+            serie = operacao(nome)(serie)
+        return serie
+    return executar
+
+#---------------------------------------------------
+# Execução do plano
+#---------------------------------------------------
+def tratar_colunas(df, plano, memo=None):
+    """
+    Trata cada coluna do plano em uma única passada: operações em sequência, tipo final e
+    padronização de nulos para o SQL, sem regravar o DataFrame a cada etapa. Colunas da fonte
+    que não estão no plano seguem sem alteração (só com os nulos padronizados).
+    Com `memo` (MemoDistintos), as operações rodam uma vez por valor distinto.
+    """
+    colunas = {}
+    for destino, origem, operacoes, tipo in plano:
+        funcao = _fundir(operacoes)
+        resultado = funcao(df[origem]) if memo is None else aplicar_por_distintos(df[origem], funcao, memo)
+        if tipo is not None:
+            resultado = resultado.astype(TIPOS[tipo])
+        colunas[destino] = padronizar_nulos_coluna(resultado)
+
+    usadas = {origem for _, origem, _, _ in plano}
+    for col in df.columns:
+        if col not in usadas and col not in colunas:
+            colunas[col] = padronizar_nulos_coluna(df[col])
+
+    return pd.DataFrame(colunas, index=df.index)
@@ -0,0 +1,112 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import argparse     # Opções da linha de comando
+import numpy as np  # Gerador de números aleatórios com semente (resultados reproduzíveis)
+import pandas as pd # Montagem das colunas e gravação do CSV
+
+#---------------------------------------------------
+# Valores usados para montar os dados sintéticos
+#---------------------------------------------------
+PRIMEIROS_NOMES = ['Ana', 'Arthur', 'Bernardo', 'Caio', 'Cauã', 'Emilly', 'Gustavo', 'Isaac', 'Joana',
+                   'João Pedro', 'Laura', 'Letícia', 'Luiz Felipe', 'Maria Eduarda', 'Miguel', 'Nicole',
+                   'Otávio', 'Pietra', 'Sofia', 'Stephany', 'Vitória', 'Vitor Gabriel']
+SOBRENOMES = ['Alves', 'Aragão', 'Caldeira', 'Campos', 'Cardoso', 'Da Mota', 'da Rocha', 'Duarte',
+              'Fernandes', 'Fogaça', 'Gonçalves', 'Lima', 'Nunes', 'Oliveira', 'Sales', 'Souza', 'Vieira']
+TITULOS = ['Sr.', 'Sra.', 'Srta.', 'Dr.', 'Dra.']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'bol.com.br', 'ig.com.br', 'silveira.com', 'moreira.br', 'lima.br']
+EMAILS_INVALIDOS = ['email_invalido@.com', 'sem-arroba.com', 'nome@dominio', '']
+TOKENS_ATIVO = ['sim', 'não', '1', '0', 'true', 'false', 'yes', 'no', '']
+FORMATOS_DATA = ['%d/%m/%Y', '%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y']
+
+#---------------------------------------------------
+# Geração de um bloco de dados "sujos"
+#---------------------------------------------------
+def gerar_bloco(linhas, rng):
+    """Gera `linhas` registros com os mesmos padrões de sujeira do arquivo de exemplo."""
+    # Nomes com caixa variada e, às vezes, um título antes (ex: "dra. sofia lima")
+    nomes = pd.Series(rng.choice(PRIMEIROS_NOMES, linhas)) + ' ' + pd.Series(rng.choice(SOBRENOMES, linhas))
+    caixa = rng.random(linhas)
+    nomes = nomes.where(caixa < 0.6, nomes.str.lower()).where(caixa < 0.8, nomes.str.upper())
+    titulos = pd.Series(rng.choice(TITULOS, linhas))
+    titulos = titulos.where(rng.random(linhas) < 0.5, titulos.str.lower())
+    nomes = nomes.where(rng.random(linhas) >= 0.15, titulos + ' ' + nomes)
+
+    # E-mails válidos, com cerca de 10% de inválidos
+    emails = (nomes.str.lower().str.replace(r'[^a-z]', '', regex=True).str[:12]
+              + pd.Series(rng.integers(0, 100, linhas)).astype(str) + '@'
+              + pd.Series(rng.choice(DOMINIOS, linhas)))
+    emails = emails.where(rng.random(linhas) >= 0.1, pd.Series(rng.choice(EMAILS_INVALIDOS, linhas)))
+
+    # Idades ausentes em ~2/3 das linhas
+    idades = pd.Series(rng.integers(18, 80, linhas)).astype(str).where(rng.random(linhas) >= 0.67, '')
+
+    # Datas em quatro formatos, com ~24% de datas impossíveis (31-02-2023)
+    datas = pd.Series(pd.Timestamp('1940-01-01') + pd.to_timedelta(rng.integers(0, 30000, linhas), unit='D'))
+    formato = rng.integers(0, len(FORMATOS_DATA), linhas)
+    texto_datas = pd.Series('', index=datas.index)
+    for i, fmt in enumerate(FORMATOS_DATA):
+        texto_datas = texto_datas.where(formato != i, datas.dt.strftime(fmt))
+    texto_datas = texto_datas.where(rng.random(linhas) >= 0.24, '31-02-2023')
+
+    # Valores com "R$ 123.4", "123,40" ou "1234.5"
+    valores = pd.Series(np.round(rng.uniform(10, 10000, linhas), 2)).astype(str)
+    estilo = rng.integers(0, 3, linhas)
+    valores = valores.where(estilo != 0, 'R$ ' + valores).where(estilo != 1, valores.str.replace('.', ',', regex=False))
+
+    # IDs de produto: "559-D", "929", "null" ou vazio
+    numeros = pd.Series(rng.integers(100, 1000, linhas)).astype(str)
+    letras = pd.Series(rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), linhas))
+    produtos = numeros.where(rng.random(linhas) >= 0.1, numeros + '-' + letras)
+    sorteio = rng.random(linhas)
+    produtos = produtos.where(sorteio >= 0.25, 'null').where((sorteio < 0.25) | (sorteio >= 0.5), '')
+
+    return pd.DataFrame({
+        'nome_cliente': nomes,
+        'email': emails,
+        'idade': idades,
+        'data_compra': texto_datas,
+        'valor_compra': valores,
+        'produto_id': produtos,
+        'ativo': rng.choice(TOKENS_ATIVO, linhas),
+    })
+
+#---------------------------------------------------
+# Geração do arquivo completo
+#---------------------------------------------------
+def gerar_csv(caminho, linhas, semente=42, taxa_duplicatas=0.02, tamanho_bloco=1_000_000):
+    """
+    Grava um CSV sintético com `linhas` registros, gerado em blocos para não ocupar muita memória.
+    Uma fração `taxa_duplicatas` de cada bloco é cópia de outras linhas do mesmo bloco.
+    A mesma `semente` sempre gera o mesmo arquivo.
+    """
+    rng = np.random.default_rng(semente)
+    gravadas = 0
+    while gravadas < linhas:
+        tamanho = min(tamanho_bloco, linhas - gravadas)
+        bloco = gerar_bloco(tamanho, rng)
+
+        # Substitui algumas linhas por cópias de outras, criando duplicatas
+        copias = int(tamanho * taxa_duplicatas)
+        if copias:
+            destino = rng.choice(tamanho, copias, replace=False)
+            origem = rng.integers(0, tamanho, copias)
+            bloco.iloc[destino] = bloco.iloc[origem].to_numpy()
+
+        bloco.to_csv(caminho, mode='w' if gravadas == 0 else 'a', header=gravadas == 0, index=False)
+        gravadas += tamanho
+
+    print(f"✅ Arquivo sintético com {linhas} linhas gerado em '{caminho}'.")
+    return caminho
+
+
+# Uso: python gerar_dados.py <caminho_saida> <linhas> [--semente N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um CSV sintético com dados de clientes 'sujos'.")
+    parser.add_argument('caminho')
+    parser.add_argument('linhas', type=int)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--taxa-duplicatas', type=float, default=0.02)
+    args = parser.parse_args()
+
+    gerar_csv(args.caminho, args.linhas, args.semente, args.taxa_duplicatas)
@@ -0,0 +1,80 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import os           # Verifica se o índice de fingerprints já existe
+import pandas as pd # Biblioteca para manipulação de dados em formato de tabelas (DataFrames)
+
+# Função de upsert no banco
+from conexao_banco import upsert_to_database_schema
+
+#---------------------------------------------------
+# Fingerprint (hash) do conteúdo de cada linha
+#---------------------------------------------------
+def calcular_fingerprints(df, chave='cliente_id'):
+    """
+    Retorna uma Series (indexada pelo `chave`) com um hash de 64 bits do conteúdo de cada linha.
+    Se qualquer coluna da linha mudar, o hash muda.
+    """
+    conteudo = df.drop(columns=[chave]).astype(str)  # Texto, para o hash não depender do dtype inferido
+    hashes = pd.util.hash_pandas_object(conteudo, index=False).to_numpy()
+    return pd.Series(hashes, index=df[chave].to_numpy(), name='fingerprint')
+
+#---------------------------------------------------
+# Leitura e gravação do índice de fingerprints
+#---------------------------------------------------
+def carregar_indice(caminho_indice):
+    """Carrega o índice {cliente_id: fingerprint} da última carga (vazio se ainda não existir)."""
+    if not os.path.exists(caminho_indice):
+        print("ℹ️ Índice de fingerprints não encontrado: todas as linhas serão tratadas como novas.")
+        return pd.Series(dtype='uint64', name='fingerprint')
+    indice = pd.read_parquet(caminho_indice)
+    return indice.set_index('cliente_id')['fingerprint']
+
+def salvar_indice(indice, caminho_indice):
+    """Grava o índice de fingerprints em Parquet."""
+    indice.rename_axis('cliente_id').reset_index().to_parquet(caminho_indice, index=False)
+    print(f"✅ Índice de fingerprints salvo em '{caminho_indice}' ({len(indice)} linhas).")
+
+#---------------------------------------------------
+# Detecção das linhas novas ou alteradas
+#---------------------------------------------------
+def detectar_alteracoes(df, indice, chave='cliente_id'):
+    """
+    Compara o DataFrame tratado com o índice da última carga.
+    Retorna (delta, fingerprints): as linhas novas ou alteradas e os fingerprints de todas as linhas atuais.
+    """
+    # Linhas com a mesma chave são a mesma compra: só a primeira é considerada
+    repetidas = df[chave].duplicated(keep='first')
+    if repetidas.any():
+        print(f"⚠️ {int(repetidas.sum())} linhas com '{chave}' repetido ignoradas.")
+        df = df[~repetidas]
+
+    fingerprints = calcular_fingerprints(df, chave)
+    # Compara em uint64 (sem passar por float, que perderia precisão); chaves novas contam como alteradas
+    existentes = fingerprints.index.isin(indice.index)
+    anteriores = indice.reindex(fingerprints.index, fill_value=0).to_numpy(dtype='uint64')
+    alteradas = ~(existentes & (anteriores == fingerprints.to_numpy()))
+
+    delta = df[alteradas]
+    print(f"ℹ️ {len(delta)} de {len(df)} linhas são novas ou foram alteradas desde a última carga.")
+    return delta, fingerprints
+
+#---------------------------------------------------
+# Carga incremental completa
+#---------------------------------------------------
+def executar_incremental(df, engine, schema_name, table_name, caminho_indice, chave='cliente_id'):
+    """
+    Envia ao banco só as linhas novas ou alteradas (upsert pela `chave`) e atualiza o índice.
+    O `cliente_id` precisa ser determinístico (padronizar_cliente_id(df, deterministico=True)).
+    Linhas que deixaram de aparecer no arquivo de origem não são apagadas da tabela.
+    Retorna a quantidade de linhas enviadas.
+    """
+    indice = carregar_indice(caminho_indice)
+    delta, fingerprints = detectar_alteracoes(df, indice, chave)
+
+    upsert_to_database_schema(delta, engine, schema_name, table_name, chave)
+
+    # O índice só é atualizado depois que o banco recebeu as alterações
+    indice = pd.concat([indice[~indice.index.isin(fingerprints.index)], fingerprints])
+    salvar_indice(indice, caminho_indice)
+    return len(delta)
@@ -0,0 +1,191 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import copy          # Cópia da especificação, para ajustar o cliente_id sem alterar a original
+import glob          # Arquivos de entrada a partir de um padrão (ex: ../data/entrada/*.csv)
+import json          # Manifesto dos arquivos já processados
+import os            # Caminhos, tamanho e data de modificação dos arquivos
+import queue         # Fila limitada entre a varredura dos arquivos e os workers
+import threading     # Workers e travas do manifesto e do envio ao banco
+import time          # Latência por arquivo e intervalo entre as varreduras
+from datetime import datetime  # Horário de conclusão registrado no manifesto
+import numpy as np   # Percentis da latência no resumo final
+
+from acesso_CSV import save_cleaned_data              # Grava o CSV tratado de cada arquivo
+from conexao_banco import upsert_to_database_schema   # Insere ou atualiza os dados tratados na tabela do banco
+from especificacao import ESPECIFICACAO_CLIENTES      # Regras padrão (as mesmas do pipeline completo)
+from instrumentacao import RelatorioExecucao          # Medição das etapas de cada arquivo (--relatorio)
+from pipeline import executar_especificacao           # Leitura, limpeza, duplicatas e cliente_id de um arquivo
+
+#---------------------------------------------------
+# Ingestão contínua de vários arquivos
+#---------------------------------------------------
+# Um único processo trata muitos arquivos: os módulos, o engine do banco (e seu pool de conexões)
+# e os segredos são carregados uma vez e reaproveitados por todos. Uma varredura encontra os
+# arquivos (pasta ou padrão glob) e os coloca em uma fila limitada; `workers` threads tratam e
+# enviam cada arquivo. O manifesto registra os arquivos concluídos, para que um reinício pule
+# o que já foi feito.
+
+# Assinatura do arquivo: muda se ele for substituído ou alterado (sem precisar ler o conteúdo)
+def assinatura_arquivo(caminho):
+    info = os.stat(caminho)
+    return f"{info.st_size}-{info.st_mtime_ns}"
+
+# Arquivos CSV de uma pasta ou de um padrão glob, em ordem alfabética
+def listar_arquivos(origem):
+    padrao = os.path.join(origem, '*.csv') if os.path.isdir(origem) else origem
+    return sorted(caminho for caminho in glob.glob(padrao) if os.path.isfile(caminho))
+
+class Manifesto:
+    """
+    Registro dos arquivos processados ({caminho absoluto: assinatura, status, linhas, latência, ...}),
+    gravado em JSON após cada arquivo. Arquivos com status 'ok' e a mesma assinatura são pulados.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self.arquivos = {}
+        self._trava = threading.Lock()
+        if caminho and os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                self.arquivos = json.load(arquivo)
+
+    def concluido(self, caminho, assinatura):
+        registro = self.arquivos.get(os.path.abspath(caminho))
+        return registro is not None and registro['status'] == 'ok' and registro['assinatura'] == assinatura
+
+    def registrar(self, caminho, **dados):
+        with self._trava:
+            self.arquivos[os.path.abspath(caminho)] = dados
+            if not self.caminho:
+                return
+            # Grava em um arquivo temporário e o renomeia, para nunca deixar um JSON pela metade
+            temporario = f"{self.caminho}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump(self.arquivos, arquivo, indent=2)
+            os.replace(temporario, self.caminho)
+
+#---------------------------------------------------
+# Tratamento de um arquivo
+#---------------------------------------------------
+def processar_arquivo(caminho, especificacao, pasta_saida, enviar=None, por_distintos=False, quarentena=False,
+                      relatorio=None):
+    """
+    Trata um arquivo segundo a especificação, grava '<nome>_limpo.csv' em `pasta_saida`
+    (e '<nome>_quarentena.csv', com quarentena=True) e, se `enviar` for informado, envia o resultado.
+    Com `relatorio` (RelatorioExecucao), o tratamento, a gravação e o envio são medidos.
+    Retorna o número de linhas tratadas.
+    """
+    medir = (relatorio or RelatorioExecucao(ativo=False)).medir
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    quarentena_path = os.path.join(pasta_saida, f"{nome}_quarentena.csv") if quarentena else None
+
+    df = medir(executar_especificacao, especificacao, caminho, por_distintos=por_distintos,
+               quarentena_path=quarentena_path)
+    medir(save_cleaned_data, df, os.path.join(pasta_saida, f"{nome}_limpo.csv"))
+    if enviar is not None:
+        medir(enviar, df)
+    return len(df)
+
+#---------------------------------------------------
+# Fila, workers e varredura
+#---------------------------------------------------
+def executar_ingestao(origem, pasta_saida, engine=None, schema_name=None, table_name=None, manifesto_path=None,
+                      workers=2, tamanho_fila=None, observar=None, espera_estavel=2.0, especificacao=None,
+                      por_distintos=False, quarentena=False, relatorio=None):
+    """
+    Processa os arquivos CSV de `origem` (pasta ou padrão glob) com `workers` threads.
+
+    A fila aceita até `tamanho_fila` arquivos (padrão: 2 por worker); quando está cheia, a varredura
+    espera, e a memória fica limitada aos arquivos em tratamento. Sem `observar`, processa os arquivos
+    encontrados e termina; com `observar` (segundos), varre `origem` de novo nesse intervalo até Ctrl+C,
+    ignorando arquivos modificados há menos de `espera_estavel` segundos (ainda sendo copiados).
+
+    Com `engine`, cada arquivo é aplicado a schema_name.table_name por upsert do cliente_id, que é
+    determinístico: reprocessar um arquivo (alterado, ou após uma queda antes do registro no manifesto)
+    não duplica linhas. Os envios ao banco são feitos um de cada vez; a leitura e a limpeza, em paralelo.
+    Com `relatorio` (RelatorioExecucao), as etapas de cada arquivo são medidas.
+    Retorna a lista de resultados por arquivo (caminho, status, linhas e latências).
+    """
+    especificacao = copy.deepcopy(especificacao or ESPECIFICACAO_CLIENTES)
+    if especificacao.get('cliente_id') is not None:
+        especificacao['cliente_id']['deterministico'] = True
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    manifesto = Manifesto(manifesto_path)
+    fila = queue.Queue(maxsize=tamanho_fila or 2 * workers)
+    resultados = []
+
+    # O upsert usa uma tabela '<tabela>_delta' única, então um envio por vez
+    trava_envio = threading.Lock()
+
+    def enviar_ao_banco(df):
+        with trava_envio:
+            upsert_to_database_schema(df, engine, schema_name, table_name)
+
+    def worker():
+        while True:
+            item = fila.get()
+            if item is None:  # Sinal de fim
+                return
+            caminho, assinatura, enfileirado = item
+            inicio = time.perf_counter()
+            registro = {'assinatura': assinatura}
+            try:
+                linhas = processar_arquivo(caminho, especificacao, pasta_saida,
+                                           enviar_ao_banco if engine is not None else None,
+                                           por_distintos, quarentena, relatorio)
+                registro.update(status='ok', linhas=linhas)
+            except Exception as e:
+                registro.update(status='erro', erro=str(e))
+                print(f"❌ Erro ao processar '{caminho}': {e}")
+
+            fim = time.perf_counter()
+            registro.update(segundos=round(fim - inicio, 3), espera_na_fila=round(inicio - enfileirado, 3),
+                            concluido_em=datetime.now().isoformat(timespec='seconds'))
+            manifesto.registrar(caminho, **registro)
+            resultados.append({'caminho': caminho, **registro})
+            if registro['status'] == 'ok':
+                print(f"✅ '{os.path.basename(caminho)}': {registro['linhas']} linhas em {registro['segundos']:.2f}s"
+                      f" (+{registro['espera_na_fila']:.2f}s na fila).")
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    vistos = {}  # Arquivo -> assinatura já enfileirada nesta execução (inclusive os que falharam)
+    try:
+        while True:
+            for caminho in listar_arquivos(origem):
+                assinatura = assinatura_arquivo(caminho)
+                if vistos.get(caminho) == assinatura or manifesto.concluido(caminho, assinatura):
+                    continue
+                if observar and time.time() - os.path.getmtime(caminho) < espera_estavel:
+                    continue  # Arquivo ainda sendo gravado: fica para a próxima varredura
+                vistos[caminho] = assinatura
+                fila.put((caminho, assinatura, time.perf_counter()))  # Bloqueia enquanto a fila estiver cheia
+            if not observar:
+                break
+            time.sleep(observar)
+    except KeyboardInterrupt:
+        print("ℹ️ Ingestão interrompida: concluindo os arquivos já na fila.")
+    finally:
+        for _ in threads:
+            fila.put(None)
+        for thread in threads:
+            thread.join()
+
+    exibir_resumo(resultados)
+    return resultados
+
+# Resumo da ingestão: arquivos, linhas e latência por arquivo (mediana, p95 e máxima)
+def exibir_resumo(resultados):
+    if not resultados:
+        print("ℹ️ Nenhum arquivo novo para processar.")
+        return
+    concluidos = [r for r in resultados if r['status'] == 'ok']
+    latencias = np.array([r['segundos'] for r in resultados])
+    print(f"✅ Ingestão concluída: {len(concluidos)} de {len(resultados)} arquivos, "
+          f"{sum(r['linhas'] for r in concluidos)} linhas | latência por arquivo: "
+          f"mediana {np.percentile(latencias, 50):.2f}s, p95 {np.percentile(latencias, 95):.2f}s, "
+          f"máxima {latencias.max():.2f}s.")
@@ -0,0 +1,205 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import cProfile     # Perfil detalhado por função (opcional)
+import json         # Gravação do relatório da execução
+import os           # Tamanho da página de memória (leitura do RSS em /proc)
+import threading    # Amostragem da memória em paralelo à etapa medida
+import time         # Medição do tempo de cada etapa
+from datetime import datetime  # Horário de início da execução
+import pandas as pd # Contagem de linhas e nulos dos DataFrames
+import pyarrow as pa  # Memória alocada pelo pool do Arrow (colunas string[pyarrow], leitura com engine='pyarrow')
+
+#---------------------------------------------------
+# Memória do processo
+#---------------------------------------------------
+# A memória é medida pelo RSS do processo (tudo o que ele ocupa na RAM: Python, NumPy e Arrow)
+# e pelos bytes alocados no pool do Arrow, que o tracemalloc não enxerga. O tracemalloc foi
+# descartado: ele intercepta cada alocação do Python e deixava as etapas até ~5x mais lentas.
+
+# RSS atual do processo em bytes (psutil, se instalado; senão /proc no Linux; None se indisponível)
+def memoria_processo():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class AmostradorMemoria:
+    """
+    Lê o RSS e a memória do Arrow a cada `intervalo` segundos, em uma thread, enquanto a etapa roda,
+    e guarda o maior valor de cada um. O custo é uma leitura a cada poucos milissegundos, sem
+    interferir nas alocações da etapa.
+    """
+
+    def __init__(self, intervalo=0.01):
+        self.intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread = None
+        self.rss_inicial = self.pico_rss = memoria_processo()
+        self.arrow_inicial = self.pico_arrow = pa.total_allocated_bytes()
+
+    def _amostrar(self):
+        rss = memoria_processo()
+        if rss is not None:
+            self.pico_rss = max(self.pico_rss, rss)
+        self.pico_arrow = max(self.pico_arrow, pa.total_allocated_bytes())
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self._amostrar()
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+        self._amostrar()  # Última leitura, ao fim da etapa
+        return self
+
+#---------------------------------------------------
+# Relatório de execução do pipeline
+#---------------------------------------------------
+class RelatorioExecucao:
+    """
+    Mede cada etapa do pipeline (tempo, linhas de entrada e saída, linhas/s e valores anulados
+    ou rejeitados) e grava tudo em um relatório JSON.
+    Com memoria=True, mede também o pico de memória de cada etapa (RSS do processo e pool do Arrow).
+    A amostragem tem custo pequeno, mas para comparar tempos use execuções sem ela.
+    Com `perfil_path`, grava também um perfil do cProfile (só quando `ativo`).
+    Quando `ativo` é False, `medir` apenas chama a função, sem custo extra.
+    """
+
+    def __init__(self, ativo=True, perfil_path=None, memoria=False):
+        self.ativo = ativo
+        self.perfil_path = perfil_path
+        self.memoria = ativo and memoria
+        self.etapas = []
+        self.inicio = datetime.now().isoformat(timespec='seconds')
+        self._relogio = time.perf_counter()
+        self._perfil = None
+        self._pico_absoluto = None  # Maior RSS do processo em qualquer etapa (com memoria=True)
+
+        if self.ativo and self.perfil_path:
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+
+    def medir(self, funcao, *args, rejeitados=None, **kwargs):
+        """
+        Executa `funcao(*args, **kwargs)` e registra as métricas da etapa.
+        O primeiro DataFrame em `args` é a entrada; a saída é o DataFrame retornado
+        (ou a própria entrada, para as funções que alteram o DataFrame no lugar).
+        `rejeitados` é uma função opcional que conta, no DataFrame de saída, os valores rejeitados pela etapa.
+        """
+        if not self.ativo:
+            return funcao(*args, **kwargs)
+
+        entrada = next((arg for arg in args if isinstance(arg, pd.DataFrame)), None)
+        linhas_entrada = len(entrada) if entrada is not None else 0
+        nulos_entrada = int(entrada.isna().sum().sum()) if entrada is not None else 0
+
+        amostrador = AmostradorMemoria().iniciar() if self.memoria else None
+        inicio = time.perf_counter()
+
+        resultado = funcao(*args, **kwargs)
+
+        duracao = time.perf_counter() - inicio
+        pico_memoria, pico_arrow = None, None
+        if amostrador is not None:
+            amostrador.parar()
+            pico_arrow = self._mb(amostrador.pico_arrow - amostrador.arrow_inicial)
+            if amostrador.pico_rss is not None:
+                pico_memoria = self._mb(amostrador.pico_rss - amostrador.rss_inicial)
+                self._pico_absoluto = max(self._pico_absoluto or 0, amostrador.pico_rss)
+
+        saida = resultado if isinstance(resultado, pd.DataFrame) else entrada
+        linhas_saida = len(saida) if saida is not None else 0
+        linhas_base = linhas_entrada or linhas_saida  # load_data não tem DataFrame de entrada
+
+        self.etapas.append({
+            'etapa': funcao.__name__,
+            'segundos': round(duracao, 6),
+            'linhas_entrada': linhas_entrada,
+            'linhas_saida': linhas_saida,
+            'linhas_por_segundo': round(linhas_base / duracao, 1) if duracao > 0 else None,
+            'pico_memoria_mb': pico_memoria,  # Aumento do RSS durante a etapa (None sem memoria=True)
+            'pico_arrow_mb': pico_arrow,      # Aumento da memória do pool do Arrow durante a etapa
+            'valores_anulados': self._contar_anulados(entrada, saida, nulos_entrada),
+            'valores_rejeitados': int(rejeitados(saida)) if rejeitados and saida is not None else 0,
+        })
+        return resultado
+
+    @property
+    def pico_memoria_mb(self):
+        """Maior RSS do processo em qualquer etapa medida até agora (None sem memoria=True)."""
+        return self._mb(self._pico_absoluto) if self._pico_absoluto is not None else None
+
+    @staticmethod
+    def _mb(valor):
+        return round(max(valor, 0) / (1024 * 1024), 3)
+
+    def resumo_por_etapa(self):
+        """
+        Soma as medições de mesmo nome (no streaming e na ingestão, cada etapa é medida uma vez por
+        bloco ou por arquivo): execuções, segundos, linhas, linhas/s e o maior pico de memória.
+        """
+        resumo = {}
+        for etapa in self.etapas:
+            total = resumo.setdefault(etapa['etapa'], {
+                'etapa': etapa['etapa'], 'execucoes': 0, 'segundos': 0.0, 'linhas_entrada': 0, 'linhas_saida': 0,
+                'pico_memoria_mb': None, 'pico_arrow_mb': None, 'valores_anulados': 0, 'valores_rejeitados': 0,
+            })
+            total['execucoes'] += 1
+            total['segundos'] += etapa['segundos']
+            for campo in ('linhas_entrada', 'linhas_saida', 'valores_anulados', 'valores_rejeitados'):
+                total[campo] += etapa[campo]
+            for campo in ('pico_memoria_mb', 'pico_arrow_mb'):
+                if etapa[campo] is not None:
+                    total[campo] = max(total[campo] or 0, etapa[campo])
+        for total in resumo.values():
+            linhas = total['linhas_entrada'] or total['linhas_saida']
+            total['segundos'] = round(total['segundos'], 6)
+            total['linhas_por_segundo'] = round(linhas / total['segundos'], 1) if total['segundos'] > 0 else None
+        return sorted(resumo.values(), key=lambda e: e['segundos'], reverse=True)
+
+    @staticmethod
+    def _contar_anulados(entrada, saida, nulos_entrada):
+        """Quantos valores a etapa transformou em nulo (diferença na contagem de nulos)."""
+        if entrada is None or saida is None:
+            return 0
+        return max(int(saida.isna().sum().sum()) - nulos_entrada, 0)
+
+    def salvar(self, caminho):
+        """Grava o relatório JSON (e o perfil do cProfile, se ativado) e imprime um resumo por etapa."""
+        if not self.ativo:
+            return
+
+        if self._perfil is not None:
+            self._perfil.disable()
+            self._perfil.dump_stats(self.perfil_path)  # Abrir com: python -m pstats <arquivo>
+            print(f"✅ Perfil do cProfile salvo em '{self.perfil_path}'.")
+
+        relatorio = {
+            'inicio': self.inicio,
+            'segundos_total': round(time.perf_counter() - self._relogio, 6),
+            'pico_memoria_total_mb': self.pico_memoria_mb,
+            'resumo_por_etapa': self.resumo_por_etapa(),
+            'etapas': self.etapas,
+        }
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+        print("\n⏱️ Tempo por etapa:")
+        for etapa in relatorio['resumo_por_etapa']:
+            memoria = f"  {etapa['pico_memoria_mb']:>9.1f} MB" if etapa['pico_memoria_mb'] is not None else ""
+            vezes = f"  ({etapa['execucoes']}x)" if etapa['execucoes'] > 1 else ""
+            print(f"   {etapa['etapa']:<28} {etapa['segundos']:>9.3f}s{memoria}{vezes}")
+        print(f"✅ Relatório da execução salvo em '{caminho}'.")
@@ -4,17 +4,47 @@
 # Para manipulação de dados em DataFrame
 import pandas as pd
 
+# Para ler as opções da linha de comando
+import argparse
+
+# Para montar os caminhos dos arquivos de saída
+import os
+
+# Para incluir a especificação declarativa na chave do cache
+import json
+
 # Funções para carregar e salvar dados CSV
-from acesso_CSV import load_data, save_cleaned_data
+from acesso_CSV import load_data, save_cleaned_data, save_cleaned_data_parquet, save_cleaned_data_feather
 
 # Funções de tratamento dos dados (limpeza, formatação, etc.)
 from tratar_CSV import (
-    clean_names, clean_emails, clean_age, clean_dates, clean_currency,
-    clean_product_ids, clean_active_status, padronizar_cliente_id , remove_duplicates, padronizar_nulos_para_sql
+    contar_emails_invalidos, clean_names, clean_emails, clean_age, clean_dates, clean_currency,
+    clean_product_ids, clean_active_status, padronizar_cliente_id , remove_duplicates, padronizar_nulos_para_sql,
+    MemoDistintos, definir_backend, copiar_brutos
 )
 
 # Funções para conexão com banco, criação de schema e upload de dados
-from conexao_banco import connect_to_database_schema, create_schema, upload_to_database_schema
+from conexao_banco import (
+    connect_to_database_schema, create_schema, upload_to_database_schema, upload_particionado, ProvedorLocal
+)
+
+# Carga incremental: só linhas novas ou alteradas vão para o banco
+from incremental import executar_incremental
+
+# Cache dos resultados tratados, para não repetir o trabalho em arquivos que não mudaram
+from cache import chave_cache, ler_cache, salvar_cache, ja_enviado, marcar_enviado, limpar_cache
+
+# Medição de tempo e memória de cada etapa
+from instrumentacao import RelatorioExecucao
+
+# Execução do pipeline em blocos, para arquivos que não cabem na memória
+from pipeline import executar_streaming, executar_paralelo, executar_especificacao, gravar_quarentena
+
+# Pipeline declarativo (colunas e operações definidas em um arquivo JSON/YAML)
+from especificacao import carregar_especificacao
+
+# Ingestão contínua de vários arquivos (pasta observada ou padrão glob)
+from ingestao import executar_ingestao
 
 #----------------------------
 # Execução principal do script
@@ -29,7 +59,7 @@ if __name__ == "__main__":
     #----------------------------
 
     # Caminho do arquivo CSV com os dados brutos
-    csv_path = '..\data\dados_clientes_sujos_3000_v2.csv'
+    csv_path = os.path.join('..', 'data', 'dados_clientes_sujos_3000_v2.csv')
 
     # URL do Azure Key Vault (onde estão armazenadas as credenciais do banco)
     vault_url = "https://kv-academy-01.vault.azure.net/"
@@ -39,28 +69,185 @@ if __name__ == "__main__":
     table_name = "clientes_limpos"
 
     # Caminho onde os dados tratados serão salvos localmente
-    output_path = '..\data\clientes_limpos.csv'
+    output_path = os.path.join('..', 'data', 'clientes_limpos.csv')
+
+    # Linhas com valores rejeitados na validação, com os valores originais (opção --quarentena)
+    quarentena_path = os.path.join('..', 'data', 'clientes_quarentena.csv')
+
+    # Índice com o fingerprint de cada linha já carregada (usado no modo incremental)
+    indice_path = os.path.join('..', 'data', 'indice_incremental.parquet')
+
+    # Pasta do cache de resultados tratados (Parquet) e seu tamanho máximo
+    cache_path = os.path.join('..', 'data', 'cache')
+    cache_limite_mb = 500
+
+    # Checkpoint do upload particionado (partições já enviadas, para retomar uma carga interrompida)
+    checkpoint_path = os.path.join('..', 'data', 'checkpoint_upload.json')
+
+    # Modo de ingestão: pasta dos arquivos tratados e manifesto dos arquivos já processados
+    pasta_limpos = os.path.join('..', 'data', 'limpos')
+    manifesto_path = os.path.join('..', 'data', 'manifesto_ingestao.json')
+
+    # Opções da linha de comando
+    parser = argparse.ArgumentParser(description="Pipeline de limpeza e carga dos dados de clientes.")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Processa o CSV em blocos com esse número de linhas (modo streaming).")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Trata o DataFrame em partições paralelas com esse número de processos.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Usa cliente_id determinístico e envia ao banco só as linhas novas ou alteradas (upsert).")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Ignora o cache e refaz a leitura e a limpeza.")
+    parser.add_argument('--limpar-cache', action='store_true',
+                        help="Apaga o cache de resultados tratados antes de executar.")
+    parser.add_argument('--pular-upload-em-cache', action='store_true',
+                        help="Não reenvia ao banco um resultado do cache que foi o último enviado à mesma tabela.")
+    parser.add_argument('--formato-binario', choices=['parquet', 'feather'], default=None,
+                        help="Além do CSV, salva os dados tratados em Parquet ou Feather (com os tipos preservados).")
+    parser.add_argument('--relatorio', default=None,
+                        help="Mede tempo e linhas de cada etapa e grava um relatório JSON nesse caminho.")
+    parser.add_argument('--memoria', action='store_true',
+                        help="Junto com --relatorio, mede também o pico de memória (RSS e Arrow) de cada etapa.")
+    parser.add_argument('--perfil', default=None,
+                        help="Junto com --relatorio, grava também um perfil do cProfile nesse caminho.")
+    parser.add_argument('--dedup-normalizada', action='store_true',
+                        help="Na remoção de duplicatas, ignora maiúsculas/minúsculas e espaços extras nas colunas-chave.")
+    parser.add_argument('--segredos-locais', nargs='?', const='', default=None, metavar='ARQUIVO_JSON',
+                        help="Lê os segredos do banco de variáveis de ambiente (e do JSON informado) em vez do Key Vault.")
+    parser.add_argument('--upload-paralelo', type=int, default=None, metavar='WORKERS',
+                        help="Envia os dados em partições paralelas, com novas tentativas e checkpoint para retomar.")
+    parser.add_argument('--por-distintos', action='store_true',
+                        help="Trata cada valor distinto de uma coluna uma única vez e reaproveita o resultado nas repetições.")
+    parser.add_argument('--especificacao', default=None, metavar='ARQUIVO',
+                        help="Trata os dados segundo uma especificação JSON/YAML (colunas, operações e tipos).")
+    parser.add_argument('--backend', choices=['pandas', 'arrow'], default='pandas',
+                        help="Backend das limpezas por coluna: 'pandas' (padrão) ou 'arrow' (pyarrow.compute em threads).")
+    parser.add_argument('--quarentena', nargs='?', const=quarentena_path, default=None, metavar='ARQUIVO_CSV',
+                        help="Marca cada linha com um código de erro por coluna, anula os valores rejeitados "
+                             "e grava as linhas rejeitadas, com os valores originais, nesse CSV (sem usar o cache).")
+    parser.add_argument('--ingestao', default=None, metavar='PASTA_OU_PADRAO',
+                        help="Processa todos os CSVs de uma pasta (ou de um padrão glob) em um único processo, "
+                             "pulando os já registrados no manifesto.")
+    parser.add_argument('--observar', type=float, nargs='?', const=10.0, default=None, metavar='SEGUNDOS',
+                        help="Com --ingestao, continua observando a pasta e varre de novo a cada SEGUNDOS (padrão: 10).")
+    parser.add_argument('--arquivos-em-paralelo', type=int, default=2, metavar='N',
+                        help="Com --ingestao, número de arquivos tratados ao mesmo tempo.")
+    args = parser.parse_args()
+
+    # Opções do fluxo completo que o streaming e a ingestão não aplicam: recusadas em vez de ignoradas
+    for modo_blocos, opcao_modo in ((args.chunksize, '--chunksize'), (args.ingestao, '--ingestao')):
+        if not modo_blocos:
+            continue
+        for ativa, opcao in ((args.upload_paralelo, '--upload-paralelo'), (args.formato_binario, '--formato-binario'),
+                             (args.workers, '--workers')):
+            if ativa:
+                parser.error(f"{opcao} não pode ser usado com {opcao_modo}.")
+
+    # Backend das limpezas por coluna (o resultado é o mesmo; muda só a velocidade)
+    definir_backend(args.backend)
+
+    # Especificação declarativa: substitui a sequência fixa de etapas abaixo
+    especificacao = carregar_especificacao(args.especificacao) if args.especificacao else None
+    if especificacao is not None and args.incremental and especificacao.get('cliente_id') is not None:
+        especificacao['cliente_id']['deterministico'] = True  # A carga incremental exige cliente_id estável
+
+    # Origem dos segredos do banco: Key Vault (padrão) ou substituto local para testes
+    provedor = None if args.segredos_locais is None else ProvedorLocal(args.segredos_locais or None)
+
+    # Instrumentação das etapas (sem custo quando --relatorio não é informado)
+    relatorio = RelatorioExecucao(ativo=bool(args.relatorio), perfil_path=args.perfil, memoria=args.memoria)
+    medir = relatorio.medir
+
+    # Tabela de destino; o cache registra qual resultado foi o último enviado a ela (--pular-upload-em-cache)
+    destino = f"{schema_name}.{table_name}"
 
     #----------------------------
-    # 1. Carregamento dos dados
+    # Modo ingestão: muitos arquivos com os mesmos módulos, engine e conexões
     #----------------------------
-    df = load_data(csv_path)
+    if args.ingestao:
+        engine = connect_to_database_schema(vault_url, provedor, pool_size=max(5, args.arquivos_em_paralelo))
+        create_schema(engine, schema_name)
+        marcar_enviado(cache_path, None, destino)  # A tabela vai mudar: nenhum resultado do cache fica nela
+        executar_ingestao(args.ingestao, pasta_limpos, engine, schema_name, table_name, manifesto_path,
+                          workers=args.arquivos_em_paralelo, observar=args.observar, especificacao=especificacao,
+                          por_distintos=args.por_distintos, quarentena=bool(args.quarentena),
+                          relatorio=relatorio)
+        if args.relatorio:
+            relatorio.salvar(args.relatorio)
+        raise SystemExit(0)
 
     #----------------------------
-    # 2. Limpeza e tratamento dos dados
+    # Modo streaming: lê, trata e grava bloco a bloco
     #----------------------------
+    if args.chunksize:
+        engine = connect_to_database_schema(vault_url, provedor)
+        create_schema(engine, schema_name)
+        marcar_enviado(cache_path, None, destino)  # A tabela vai mudar: nenhum resultado do cache fica nela
+        executar_streaming(csv_path, output_path, args.chunksize, engine, schema_name, table_name,
+                           normalizar_chaves=args.dedup_normalizada, por_distintos=args.por_distintos,
+                           especificacao=especificacao, quarentena_path=args.quarentena, relatorio=relatorio,
+                           indice_path=indice_path if args.incremental else None)
+        if args.relatorio:
+            relatorio.salvar(args.relatorio)
+        raise SystemExit(0)
+
+    #----------------------------
+    # 0. Cache: se o arquivo e as regras não mudaram, reaproveita o resultado tratado
+    #----------------------------
+    if args.limpar_cache:
+        limpar_cache(cache_path)
+
+    modo = f"incremental={args.incremental}|dedup_normalizada={args.dedup_normalizada}"  # Opções que mudam o resultado
+    if especificacao is not None:
+        modo += f"|especificacao={json.dumps(especificacao, sort_keys=True)}"
+    # A quarentena precisa dos valores originais de cada execução (e grava o próprio CSV): sem cache
+    usar_cache = not args.sem_cache and not args.quarentena
+    chave = chave_cache(csv_path, modo) if usar_cache else None
+    df = ler_cache(cache_path, chave) if chave else None
+    em_cache = df is not None
+
+    if not em_cache and especificacao is not None:
+        # Leitura, limpeza por coluna, nulos, duplicatas e cliente_id conforme a especificação
+        df = medir(executar_especificacao, especificacao, csv_path, por_distintos=args.por_distintos,
+                   quarentena_path=args.quarentena)
+        if chave:
+            salvar_cache(df, cache_path, chave, cache_limite_mb)
 
-    clean_names(df)             # Remove sujeiras dos nomes e padroniza
-    clean_emails(df)            # Valida e limpa os e-mails
-    clean_age(df)               # Converte idade para inteiro ou marca como ausente
-    clean_dates(df)             # Padroniza o formato das datas
-    clean_currency(df)          # Converte valores monetários em float
-    clean_product_ids(df)       # Corrige IDs de produtos
-    clean_active_status(df)     # Converte status ativo para booleano
-    remove_duplicates(df)       # Remove registros duplicados
-    padronizar_cliente_id(df)   # Padroniza cliente_id
-    padronizar_nulos_para_sql(df) #Padroniza nulos para o SQL
+    elif not em_cache:
+        #----------------------------
+        # 1. Carregamento dos dados
+        #----------------------------
+        df = medir(load_data, csv_path)
 
+        #----------------------------
+        # 2. Limpeza e tratamento dos dados
+        #----------------------------
+
+        if args.workers:
+            # Partições de linhas em vários processos; dedup e nulos rodam depois, sobre o resultado unido
+            df = medir(executar_paralelo, df, args.workers, ids_deterministicos=args.incremental,
+                       normalizar_chaves=args.dedup_normalizada, por_distintos=args.por_distintos,
+                       quarentena_path=args.quarentena)
+        else:
+            memo = MemoDistintos() if args.por_distintos else None  # Execução por valores distintos
+            bruto = copiar_brutos(df) if args.quarentena else None  # Valores originais, para a quarentena
+            medir(clean_names, df, memo)             # Remove sujeiras dos nomes e padroniza
+            medir(clean_emails, df, memo, rejeitados=contar_emails_invalidos)  # Valida e limpa os e-mails
+            medir(clean_age, df, memo)               # Converte idade para inteiro ou marca como ausente
+            medir(clean_dates, df, memo)             # Padroniza o formato das datas
+            medir(clean_currency, df, memo)          # Converte valores monetários em float
+            medir(clean_product_ids, df, memo)       # Corrige IDs de produtos
+            medir(clean_active_status, df, memo)     # Converte status ativo para booleano
+            if bruto is not None:
+                df = medir(gravar_quarentena, bruto, df, args.quarentena)  # Código de erro e linhas rejeitadas
+            df = medir(remove_duplicates, df, normalizar_chaves=args.dedup_normalizada)  # Remove registros duplicados
+            medir(padronizar_cliente_id, df, deterministico=args.incremental)   # Padroniza cliente_id
+            df = medir(padronizar_nulos_para_sql, df) #Padroniza nulos para o SQL
+            if memo is not None:
+                memo.exibir()
+
+        if chave:
+            salvar_cache(df, cache_path, chave, cache_limite_mb)
 
     # 2.1 Visualização das 50 primeiras linhas após limpeza
     pd.set_option('display.max_columns', None)  # Mostra todas as colunas
@@ -73,10 +260,24 @@ if __name__ == "__main__":
     #----------------------------
     save_cleaned_data(df, output_path)
 
+    # Cópia em formato colunar binário, para leituras rápidas e tipadas (ver load_cleaned_data)
+    if args.formato_binario == 'parquet':
+        save_cleaned_data_parquet(df, os.path.splitext(output_path)[0] + '.parquet')
+    elif args.formato_binario == 'feather':
+        save_cleaned_data_feather(df, os.path.splitext(output_path)[0] + '.feather')
+
+    # 3.1 Resultado vindo do cache que foi o último enviado a essa tabela: não precisa reenviar
+    if em_cache and args.pular_upload_em_cache and ja_enviado(cache_path, chave, destino):
+        print(f"ℹ️ Resultado já enviado para '{destino}' em uma execução anterior: upload ignorado.")
+        if args.relatorio:
+            relatorio.salvar(args.relatorio)
+        raise SystemExit(0)
+
     #----------------------------
     # 4. Conecta ao banco de dados
     #----------------------------
-    engine = connect_to_database_schema(vault_url)
+    # O pool precisa de uma conexão por worker do upload particionado
+    engine = connect_to_database_schema(vault_url, provedor, pool_size=max(5, args.upload_paralelo or 0))
 
     #----------------------------
     # 5. Cria o schema no banco (caso ainda não exista)
@@ -86,4 +287,20 @@ if __name__ == "__main__":
     #----------------------------
     # 6. Envia os dados para o banco (tabela no schema definido)
     #----------------------------
-    upload_to_database_schema(df, engine, schema_name, table_name)
+    marcar_enviado(cache_path, None, destino)  # Até o envio terminar, nenhum resultado é dado como enviado
+    if args.incremental:
+        medir(executar_incremental, df, engine, schema_name, table_name, indice_path)  # Upsert só do que mudou
+    elif args.upload_paralelo:
+        medir(upload_particionado, df, engine, schema_name, table_name, workers=args.upload_paralelo,
+              checkpoint_path=checkpoint_path)
+    else:
+        medir(upload_to_database_schema, df, engine, schema_name, table_name)
+
+    if chave:
+        marcar_enviado(cache_path, chave, destino)
+
+    #----------------------------
+    # 7. Relatório de tempo e memória por etapa
+    #----------------------------
+    if args.relatorio:
+        relatorio.salvar(args.relatorio)
@@ -0,0 +1,290 @@
+#-------------------------------------------
+# Bibliotecas necessárias
+#-------------------------------------------
+import itertools                                              # Numeração dos blocos do streaming
+import os                                                     # Número de núcleos disponíveis
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Execução paralela
+import numpy as np  # Limites das partições de linhas
+import pandas as pd # Junção das partições tratadas
+
+# Funções para carregar e salvar dados CSV
+from acesso_CSV import load_data, load_data_chunks, save_cleaned_data, append_cleaned_data
+
+# Funções de tratamento dos dados (limpeza, formatação, etc.)
+from tratar_CSV import (
+    clean_names, clean_emails, clean_age, clean_dates, clean_currency,
+    clean_product_ids, clean_active_status, padronizar_cliente_id,
+    remove_duplicates, remove_duplicates_incremental, padronizar_nulos_para_sql, MemoDistintos, ConjuntoHashes,
+    COLUNAS_DUPLICATAS, definir_backend, copiar_brutos, separar_rejeitados, contar_rejeitados, exibir_rejeitados
+)
+import tratar_CSV  # Backend de limpeza escolhido (repassado aos processos de executar_paralelo)
+
+# Função de upload para o banco
+from conexao_banco import upload_to_database_schema
+
+# Carga incremental (upsert só das linhas novas ou alteradas)
+from incremental import executar_incremental
+
+# Pipeline declarativo: plano por coluna a partir de uma especificação
+from especificacao import esquema_leitura, planejar, tratar_colunas
+
+# Medição das etapas (relatório da execução)
+from instrumentacao import RelatorioExecucao
+
+#---------------------------------------------------
+# Limpeza de um bloco de dados
+#---------------------------------------------------
+def limpar_bloco(df, memo=None):
+    """
+    Aplica ao bloco as mesmas etapas de limpeza por coluna usadas no modo completo.
+    Com `memo` (MemoDistintos), cada coluna é tratada uma vez por valor distinto.
+    """
+    clean_names(df, memo)             # Remove sujeiras dos nomes e padroniza
+    clean_emails(df, memo)            # Valida e limpa os e-mails
+    clean_age(df, memo)               # Converte idade para inteiro ou marca como ausente
+    clean_dates(df, memo)             # Padroniza o formato das datas
+    clean_currency(df, memo)          # Converte valores monetários em float
+    clean_product_ids(df, memo)       # Corrige IDs de produtos
+    clean_active_status(df, memo)     # Converte status ativo para booleano
+    return df
+
+#---------------------------------------------------
+# Quarentena das linhas com valores rejeitados
+#---------------------------------------------------
+def gravar_quarentena(bruto, df, quarentena_path, origens=None):
+    """
+    Marca df['codigo_erro'], anula os valores rejeitados e grava as linhas com erro, com os
+    valores originais, no CSV de quarentena (ver tratar_CSV.separar_rejeitados).
+    """
+    quarentena = separar_rejeitados(bruto, df, origens)
+    save_cleaned_data(quarentena, quarentena_path)
+    exibir_rejeitados(contar_rejeitados(quarentena), len(quarentena), len(df))
+    return df
+
+#---------------------------------------------------
+# Limpeza de uma partição com as colunas em paralelo
+#---------------------------------------------------
+
+# Cada etapa de limpeza por coluna e a função que diz quais colunas ela lê e escreve
+ETAPAS_POR_COLUNA = [
+    (clean_names, lambda df: ['nome_cliente']),
+    (clean_emails, lambda df: ['email']),
+    (clean_age, lambda df: ['idade']),
+    (clean_dates, lambda df: [col for col in df.columns if 'data' in col.lower()]),
+    (clean_currency, lambda df: ['valor_compra']),
+    (clean_product_ids, lambda df: ['produto_id']),
+    (clean_active_status, lambda df: ['ativo']),
+]
+
+def limpar_particao(df, colunas_em_paralelo=True, por_distintos=False):
+    """
+    Trata uma partição de linhas. Com colunas_em_paralelo=True, cada etapa recebe só as
+    suas colunas e as etapas rodam em threads (independentes, pois não compartilham colunas).
+    Com por_distintos=True, cada coluna é tratada uma vez por valor distinto da partição.
+    """
+    memo = MemoDistintos() if por_distintos else None
+    if not colunas_em_paralelo:
+        return limpar_bloco(df, memo)
+
+    def executar_etapa(etapa, colunas):
+        parte = df[colunas].copy()
+        etapa(parte, memo)
+        return parte
+
+    tarefas = []
+    with ThreadPoolExecutor(max_workers=len(ETAPAS_POR_COLUNA)) as executor:
+        for etapa, colunas_da_etapa in ETAPAS_POR_COLUNA:
+            colunas = [col for col in colunas_da_etapa(df) if col in df.columns]
+            if colunas:  # Colunas ausentes: a etapa é ignorada
+                tarefas.append(executor.submit(executar_etapa, etapa, colunas))
+
+        for tarefa in tarefas:
+            parte = tarefa.result()
+            for col in parte.columns:
+                df[col] = parte[col]
+    return df
+
+#---------------------------------------------------
+# Execução paralela em partições de linhas
+#---------------------------------------------------
+def executar_paralelo(df, workers=None, colunas_em_paralelo=True, ids_deterministicos=False,
+                      normalizar_chaves=False, por_distintos=False, quarentena_path=None):
+    """
+    Divide o DataFrame em partições de linhas, trata cada uma em um processo separado
+    e junta o resultado na ordem original. A deduplicação, a geração do cliente_id e a
+    padronização de nulos rodam depois, sobre o DataFrame completo.
+    O resultado é igual ao da execução em série (exceto pelos UUIDs aleatórios do cliente_id,
+    a menos que ids_deterministicos=True).
+    Com `quarentena_path`, as linhas com valores rejeitados vão para esse CSV (ver gravar_quarentena).
+    """
+    bruto = copiar_brutos(df) if quarentena_path else None
+    workers = workers or os.cpu_count() or 1
+    limites = np.linspace(0, len(df), num=min(workers, max(len(df), 1)) + 1, dtype=int)
+    particoes = [df.iloc[inicio:fim] for inicio, fim in zip(limites[:-1], limites[1:])]
+
+    # Cada processo começa com o mesmo backend de limpeza do processo principal
+    with ProcessPoolExecutor(max_workers=workers, initializer=definir_backend,
+                             initargs=(tratar_CSV.BACKEND_LIMPEZA,)) as executor:
+        tratadas = list(executor.map(limpar_particao, particoes, [colunas_em_paralelo] * len(particoes),
+                                     [por_distintos] * len(particoes)))
+
+    df = pd.concat(tratadas)
+    print(f"✅ {len(particoes)} partições tratadas em paralelo com {workers} processos.")
+    if bruto is not None:
+        df = gravar_quarentena(bruto, df, quarentena_path)
+
+    # Etapas globais sobre o resultado já unido
+    df = remove_duplicates(df, normalizar_chaves)  # Remove registros duplicados
+    padronizar_cliente_id(df, deterministico=ids_deterministicos)  # Padroniza cliente_id
+    df = padronizar_nulos_para_sql(df)
+    return df
+
+#---------------------------------------------------
+# Execução do pipeline em blocos (streaming)
+#---------------------------------------------------
+def executar_streaming(csv_path, output_path, chunksize=100_000,
+                       engine=None, schema_name=None, table_name=None, normalizar_chaves=False,
+                       por_distintos=False, limite_memo=100_000, especificacao=None, quarentena_path=None,
+                       relatorio=None, indice_path=None):
+    """
+    Lê o CSV em blocos, trata cada bloco e o acrescenta ao CSV de saída e, se `engine`
+    for informado, à tabela do banco. A memória fica limitada ao tamanho do bloco mais
+    o conjunto de hashes das chaves únicas (8 bytes por linha única) usado na deduplicação.
+    Com por_distintos=True, cada coluna é tratada uma vez por valor distinto, e os resultados
+    ficam em um memo de até `limite_memo` valores por coluna, reaproveitado pelos blocos seguintes.
+    Com `especificacao`, a leitura, o tratamento das colunas e as etapas globais vêm dela (ver especificacao.py).
+    Com `quarentena_path`, as linhas com valores rejeitados de cada bloco são acrescentadas a esse CSV.
+    Com `relatorio` (RelatorioExecucao), cada etapa de cada bloco é medida (leitura, limpeza, gravação, ...).
+    Com `indice_path`, a carga no banco é incremental: o cliente_id é determinístico e cada bloco envia
+    por upsert só as linhas novas ou alteradas (ver incremental.py), sem recriar a tabela.
+    Retorna o total de linhas gravadas.
+    """
+    medir = (relatorio or RelatorioExecucao(ativo=False)).medir
+    hashes_vistos = ConjuntoHashes()  # Chaves já vistas nos blocos anteriores
+    memo = MemoDistintos(limite_memo) if por_distintos else None
+    total_lido, total_gravado = 0, 0
+    rejeitadas, contagem = 0, pd.Series(dtype='int64')  # Totais da quarentena
+
+    esquema, plano = None, None
+    duplicatas, ids = {'colunas': COLUNAS_DUPLICATAS, 'normalizar': normalizar_chaves}, {}
+    if especificacao is not None:
+        esquema = esquema_leitura(especificacao, pd.read_csv(csv_path, nrows=0).columns)  # Só o cabeçalho
+        duplicatas, ids = especificacao.get('duplicatas'), especificacao.get('cliente_id')
+    if indice_path:
+        if ids is None:
+            raise ValueError("A carga incremental exige a etapa 'cliente_id' na especificação.")
+        ids = {**ids, 'deterministico': True}  # O upsert casa as linhas pelo cliente_id
+
+    blocos = load_data_chunks(csv_path, chunksize, esquema)
+    for numero in itertools.count():
+        bloco = medir(ler_bloco, blocos)
+        if bloco is None:
+            break
+        total_lido += len(bloco)
+
+        origens = None
+        if especificacao is not None:
+            plano = plano or planejar(especificacao, bloco.columns)
+            origens = {destino: origem for destino, origem, _, _ in plano}
+        bruto = None
+        if quarentena_path:  # Valores originais, antes da limpeza, para a quarentena
+            bruto = copiar_brutos(bloco) if origens is None else copiar_brutos(bloco, origens.values())
+
+        if especificacao is None:
+            bloco = medir(limpar_bloco, bloco, memo)
+        else:
+            bloco = medir(tratar_colunas, bloco, plano, memo)  # Nulos já saem padronizados
+
+        if bruto is not None:
+            quarentena = medir(separar_rejeitados, bruto, bloco, origens)
+            append_cleaned_data(quarentena, quarentena_path, numero == 0)
+            rejeitadas += len(quarentena)
+            contagem = contagem.add(contar_rejeitados(quarentena), fill_value=0)
+
+        chaves = _colunas_chave(duplicatas, bloco)
+        if chaves:
+            bloco, hashes_vistos = medir(remove_duplicates_incremental, bloco, hashes_vistos,
+                                         duplicatas.get('normalizar', False), chaves)
+        if bloco.empty:
+            continue
+
+        bloco = bloco.copy()               # Evita SettingWithCopyWarning após o filtro de duplicatas
+        if ids is not None:
+            medir(padronizar_cliente_id, bloco, ids.get('deterministico', False), ids.get('colunas', chaves))
+        if especificacao is None:
+            bloco = medir(padronizar_nulos_para_sql, bloco)
+
+        primeiro_bloco = total_gravado == 0
+        medir(append_cleaned_data, bloco, output_path, primeiro_bloco)
+
+        if engine is not None and indice_path:
+            medir(executar_incremental, bloco, engine, schema_name, table_name, indice_path)
+        elif engine is not None:
+            # O primeiro bloco recria a tabela; os seguintes são acrescentados
+            medir(upload_to_database_schema, bloco, engine, schema_name, table_name,
+                  if_exists='replace' if primeiro_bloco else 'append')
+
+        total_gravado += len(bloco)
+        print(f"✅ Bloco {numero + 1} processado ({total_gravado} linhas gravadas até agora).")
+
+    print(f"✅ Streaming concluído: {total_lido} linhas lidas, {total_gravado} linhas gravadas.")
+    if quarentena_path:
+        exibir_rejeitados(contagem, rejeitadas, total_lido)
+    if memo is not None:
+        memo.exibir()
+    return total_gravado
+
+# Próximo bloco do leitor (None ao fim do arquivo); função própria para que a leitura apareça no relatório
+def ler_bloco(blocos):
+    return next(blocos, None)
+
+#---------------------------------------------------
+# Execução a partir de uma especificação declarativa
+#---------------------------------------------------
+
+# Colunas-chave da deduplicação presentes nos dados (lista vazia quando a etapa está desativada)
+def _colunas_chave(duplicatas, df):
+    if duplicatas is None:
+        return []
+    return [col for col in duplicatas.get('colunas', COLUNAS_DUPLICATAS) if col in df.columns]
+
+def aplicar_especificacao(df, especificacao, memo=None, quarentena_path=None):
+    """
+    Trata um DataFrame já carregado segundo a especificação: cada coluna em uma única passada
+    (operações, tipo final e nulos), depois a remoção de duplicatas e a geração do cliente_id.
+    Com `quarentena_path`, as colunas da especificação são validadas antes da deduplicação.
+    """
+    plano = planejar(especificacao, df.columns)
+    origens = {destino: origem for destino, origem, _, _ in plano}
+    bruto = copiar_brutos(df, origens.values()) if quarentena_path else None
+    df = tratar_colunas(df, plano, memo)
+    if bruto is not None:
+        df = gravar_quarentena(bruto, df, quarentena_path, origens)
+
+    duplicatas = especificacao.get('duplicatas')
+    chaves = _colunas_chave(duplicatas, df)
+    if chaves:
+        df = remove_duplicates(df, duplicatas.get('normalizar', False), colunas=chaves)
+
+    ids = especificacao.get('cliente_id')
+    if ids is not None and not df.empty:
+        padronizar_cliente_id(df, ids.get('deterministico', False), ids.get('colunas', chaves or None))
+    return df
+
+def executar_especificacao(especificacao, csv_path, output_path=None, chunksize=None, por_distintos=False,
+                           quarentena_path=None, **opcoes):
+    """
+    Executa a especificação sobre o CSV: sem `chunksize`, carrega o arquivo inteiro e retorna o
+    DataFrame tratado (modo completo); com `chunksize`, trata e grava bloco a bloco em `output_path`
+    (e no banco, se `opcoes` trouxer engine, schema_name e table_name) e retorna o total de linhas gravadas.
+    """
+    if chunksize:
+        return executar_streaming(csv_path, output_path, chunksize, por_distintos=por_distintos,
+                                  especificacao=especificacao, quarentena_path=quarentena_path, **opcoes)
+
+    esquema = esquema_leitura(especificacao, pd.read_csv(csv_path, nrows=0).columns)
+    memo = MemoDistintos() if por_distintos else None
+    df = aplicar_especificacao(load_data(csv_path, esquema), especificacao, memo, quarentena_path)
+    if memo is not None:
+        memo.exibir()
+    return df
@@ -5,25 +5,213 @@ import pandas as pd # Biblioteca para manipulação de dados em formato de tabel
 import re           # Biblioteca para trabalhar com expressões regulares (útil para limpeza de texto)
 import numpy as np  # Biblioteca para operações numéricas e tratamento de valores nulos
 import uuid         # Biblioteca para gerar identificadores únicos universais (UUID)
+import itertools    # Descarte dos valores mais antigos do memo de valores distintos
+import pyarrow as pa           # Arrays colunares do Apache Arrow
+import pyarrow.compute as pc   # Funções vetorizadas em código nativo sobre arrays Arrow
+
+#-------------------------#
+# Backend das colunas de texto
+#-------------------------#
+
+# dtype usado nas operações vetorizadas de texto: 'string[pyarrow]' (padrão) ou 'object'.
+# Com Arrow, strip/lower/upper/title e as expressões regulares (RE2) rodam em código nativo; com
+# 'object', cada operação do acessor .str é um laço em Python, mais lento que o próprio apply.
+# Os resultados são os mesmos nos dois: as linhas em que o Arrow e o Python podem divergir são
+# refeitas pela versão célula a célula (ver _fora_latin1).
+BACKEND_TEXTO = 'string[pyarrow]'
+
+# Textos em que lower/upper/title do Arrow e do Python coincidem: ASCII e letras do Latin-1 (sem ß, ÿ, ª, º e µ).
+# Fora disso (ex: "İrem", que o Python põe em minúsculas como "i̇rem"), vale a versão célula a célula.
+REGEX_FORA_LATIN1 = r'[^\x00-\x7f\xc0-\xd6\xd8-\xde\xe0-\xf6\xf8-\xfe]'
+
+# Verifica se todos os valores não nulos da coluna são strings (condição para usar o caminho vetorizado)
+def _somente_texto(serie):
+    return pd.api.types.infer_dtype(serie, skipna=True) in ('string', 'empty')
+
+# Converte a coluna para o backend de texto configurado
+def _para_backend(serie):
+    return serie if BACKEND_TEXTO == 'object' else serie.astype(BACKEND_TEXTO)
+
+# Substituição por expressão regular: com Arrow (configurado em BACKEND_TEXTO ou já vindo da leitura
+# do CSV) o padrão roda no RE2, então só deve ser usada com padrões que têm a mesma semântica no
+# `re` e no RE2 (sem \w, \s ou \b)
+def _substituir_regex(serie, padrao, novo, n=-1):
+    if serie.dtype == object:
+        return serie.str.replace(padrao, novo, n=n, regex=True)
+    return serie.str.replace(padrao.pattern, novo, n=n, regex=True)
+
+# Linhas de uma coluna Arrow com caracteres fora de REGEX_FORA_LATIN1 (em 'object' o Python já trata tudo)
+def _fora_latin1(texto):
+    if texto.dtype == object:
+        return np.zeros(len(texto), dtype=bool)
+    return texto.str.contains(REGEX_FORA_LATIN1, regex=True, na=False).to_numpy(dtype=bool)
+
+# Refaz com a função célula a célula só as linhas marcadas em `mascara`
+def _refazer_por_celula(resultado, serie, mascara, funcao):
+    if mascara.any():
+        resultado = resultado.copy()
+        resultado.iloc[np.flatnonzero(mascara)] = serie[mascara].astype(object).map(funcao).to_numpy()
+    return resultado
+
+# Volta para 'object', mantendo os nulos originais nas linhas que já eram nulas
+# (colunas lidas como 'string[pyarrow]' têm pd.NA como nulo, que vira np.nan)
+def _de_volta(resultado, original):
+    resultado = resultado.astype(object)
+    if original.dtype == object:
+        return original.where(original.isna(), resultado)
+    return resultado.where(original.notna(), np.nan)
+
+#-------------------------#
+# Execução por valores distintos (memoização)
+#-------------------------#
+
+class MemoDistintos:
+    """
+    Resultados já calculados por coluna e por valor distinto, para reaproveitar entre blocos
+    (modo streaming) ou entre execuções no mesmo processo. Guarda até `limite` valores por coluna;
+    quando enche, descarta os mais antigos. Colunas em que os valores distintos passam de
+    `proporcao_maxima` das linhas do bloco (ex: e-mails) quase não se repetem e são tratadas direto.
+    Também acumula, por coluna, as linhas tratadas, os valores distintos, quantos vieram do memo
+    e quantos valores precisaram de fato ser calculados.
+    """
+
+    def __init__(self, limite=100_000, proporcao_maxima=0.5):
+        self.limite = limite
+        self.proporcao_maxima = proporcao_maxima
+        self.valores = {}       # coluna -> {(tipo, valor): resultado}
+        self.tipos = {}         # coluna -> dtype dos resultados calculados
+        self.estatisticas = {}  # coluna -> {'linhas', 'distintos', 'do_memo', 'calculados'}
+
+    def relatorio(self):
+        """
+        Taxa de acerto por coluna: 'acerto_linhas' é a fração de linhas cujo resultado não precisou
+        ser calculado (repetições dentro do bloco ou memo) e 'acerto_memo' a fração de valores
+        distintos que já estavam no memo.
+        """
+        relatorio = pd.DataFrame.from_dict(self.estatisticas, orient='index',
+                                           columns=['linhas', 'distintos', 'do_memo', 'calculados'])
+        relatorio['acerto_linhas'] = 1 - relatorio['calculados'] / relatorio['linhas']
+        relatorio['acerto_memo'] = relatorio['do_memo'] / relatorio['distintos']
+        return relatorio
+
+    def exibir(self):
+        print("📊 Reaproveitamento por coluna (execução por valores distintos):")
+        print(self.relatorio().to_string(float_format=lambda x: f"{x:.1%}"))
+
+    def registrar(self, coluna, linhas, distintos, do_memo, calculados):
+        estatisticas = self.estatisticas.setdefault(
+            coluna, {'linhas': 0, 'distintos': 0, 'do_memo': 0, 'calculados': 0})
+        estatisticas['linhas'] += linhas
+        estatisticas['distintos'] += distintos
+        estatisticas['do_memo'] += do_memo
+        estatisticas['calculados'] += calculados
+
+def aplicar_por_distintos(serie, funcao, memo=None):
+    """
+    Executa `funcao` (que recebe e devolve uma Series) só uma vez por valor distinto de `serie`
+    e espalha os resultados de volta para as linhas, com o mesmo resultado de `funcao(serie)`.
+    O custo passa a depender do número de valores distintos, e não do número de linhas.
+    Com `memo`, os valores já calculados em blocos anteriores nem são recalculados.
+    """
+    codigos, distintos = pd.factorize(serie, use_na_sentinel=False)  # Nulos viram um valor distinto
+    distintos = pd.Series(distintos)
+    if distintos.empty:
+        return funcao(serie)
+
+    if memo is not None and len(distintos) > memo.proporcao_maxima * len(serie):
+        # Poucas repetições: mapear de volta custaria mais do que tratar a coluna inteira
+        memo.registrar(serie.name, len(serie), len(distintos), 0, len(serie))
+        return funcao(serie)
+
+    calcular = np.ones(len(distintos), dtype=bool)
+    if memo is not None:
+        cache = memo.valores.setdefault(serie.name, {})
+        # O tipo entra na chave para que 1, 1.0 e True não se confundam; nulos não vão para o memo
+        valores = distintos.to_numpy(dtype=object)
+        chaves = list(zip(map(type, valores), valores))
+        nulos = distintos.isna().to_numpy()
+        if cache:
+            calcular = np.fromiter((chave not in cache for chave in chaves), dtype=bool, count=len(chaves))
+        calcular |= nulos
+
+    calculados = funcao(distintos[calcular].reset_index(drop=True))
+
+    if calcular.all():
+        resultados = calculados
+    else:
+        # Junta os valores do memo com os recém-calculados e volta ao dtype que `funcao` devolveu para
+        # valores preenchidos (guardado no memo), para que todos os blocos saiam com o mesmo dtype
+        juntos = np.empty(len(distintos), dtype=object)
+        juntos[calcular] = calculados.to_numpy(dtype=object)
+        juntos[~calcular] = [cache[chave] for chave, calculado in zip(chaves, calcular) if not calculado]
+        resultados = pd.Series(juntos)
+        tipo = memo.tipos.get(serie.name)
+        resultados = resultados.astype(tipo) if tipo is not None else resultados.infer_objects()
+
+    if memo is not None:
+        if calculados.notna().any():  # Só nulos (ou nada) calculados não indicam o dtype da coluna
+            memo.tipos[serie.name] = calculados.dtype
+        guardar = calcular & ~nulos
+        cache.update(zip((chaves[i] for i in np.flatnonzero(guardar)),
+                         calculados.to_numpy(dtype=object)[guardar[calcular]]))
+        excesso = len(cache) - memo.limite
+        if excesso > 0:  # Descarta os mais antigos (o dict mantém a ordem de inserção)
+            for chave in list(itertools.islice(cache, excesso)):
+                del cache[chave]
+        calculados_total = int(calcular.sum())
+        memo.registrar(serie.name, len(serie), len(distintos), len(distintos) - calculados_total,
+                       calculados_total)
+
+    resultado = resultados.take(codigos)
+    resultado.index, resultado.name = serie.index, serie.name
+    return resultado
+
+# Executa a limpeza da coluna inteira ou, se houver memo, uma vez por valor distinto
+def _executar(funcao, serie, memo):
+    return funcao(serie) if memo is None else aplicar_por_distintos(serie, funcao, memo)
 
 #-------------------------#
 # 1. Limpeza de Nomes
 #-------------------------#
-def clean_names(df):
+
+# Expressões regulares pré-compiladas usadas na limpeza de nomes.
+# REGEX_ESPACOS lista explicitamente os caracteres que o \s do Python reconhece, para que o
+# resultado seja o mesmo quando a coluna usa o backend Arrow (onde \s só cobre espaços ASCII).
+REGEX_PREFIXO_NOME = re.compile(r'^[^.]*\.')   # Tudo até o primeiro ponto (ex: "Sr.", "Dra.")
+REGEX_ESPACOS = re.compile('[\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+')
+REGEX_NOME_INICIAL = re.compile(r'[a-zA-Z]\.?') # Nome que é só uma letra (como "A.")
+
+# Função auxiliar que limpa um único nome (versão célula a célula)
+def limpar_nome(nome):
+    if pd.isna(nome):  # Verifica se o valor é nulo (NaN), e se for, retorna como está
+        return nome
+    nome = nome.strip() # Remove espaços em branco do início e fim
+    if '.' in nome:     # Se houver ponto (.), como em "Sr. João", separa o nome
+        nome = nome.split('.', 1)[1]  # Remove a parte antes do ponto (ex: "Sr.")
+    nome = nome.lower()               # Converte o nome para letras minúsculas
+    nome = REGEX_ESPACOS.sub(' ', nome).strip() # Remove espaços duplicados e limpa início/fim
+    if REGEX_NOME_INICIAL.fullmatch(nome):  # Se o nome for só uma letra (como "A."), considera inválido
+        return ''
+    return nome.title() # Coloca a primeira letra de cada palavra em maiúscula (formato título)
+
+# Limpa a coluna de nomes inteira com operações do acessor .str
+def limpar_nomes_coluna(serie):
+    """Versão vetorizada de `limpar_nome`, com o mesmo resultado de `serie.apply(limpar_nome)`."""
+    if not _somente_texto(serie):  # Valores que não são texto: mantém o comportamento célula a célula
+        return serie.apply(limpar_nome)
+
+    texto = _para_backend(serie)
+    nomes = texto.str.strip()
+    nomes = _substituir_regex(nomes, REGEX_PREFIXO_NOME, '', n=1)  # Remove o título (ex: "Sr.")
+    nomes = nomes.str.lower()
+    nomes = _substituir_regex(nomes, REGEX_ESPACOS, ' ').str.strip()
+    so_inicial = nomes.str.fullmatch(REGEX_NOME_INICIAL.pattern, na=False).astype(bool)
+    nomes = nomes.str.title().astype(object).mask(so_inicial, '')
+    return _refazer_por_celula(_de_volta(nomes, serie), serie, _fora_latin1(texto), limpar_nome)
+
+def clean_names(df, memo=None):
     try:
-        def limpar_nome(nome): #Função auxiliar que será aplicada a cada nome individualmente
-            if pd.isna(nome):  # Verifica se o valor é nulo (NaN), e se for, retorna como está
-                return nome
-            nome = nome.strip() # Remove espaços em branco do início e fim
-            if '.' in nome:     # Se houver ponto (.), como em "Sr. João", separa o nome
-                nome = nome.split('.', 1)[1]  # Remove a parte antes do ponto (ex: "Sr.")
-            nome = nome.lower()               # Converte o nome para letras minúsculas
-            nome = re.sub(r'\s+', ' ', nome).strip() # Remove espaços duplicados e limpa início/fim
-            if re.fullmatch(r'[a-zA-Z]\.?', nome):  # Se o nome for só uma letra (como "A."), considera inválido
-                return ''
-            return nome.title() # Coloca a primeira letra de cada palavra em maiúscula (formato título)
-
-        df['nome_cliente'] = df['nome_cliente'].apply(limpar_nome)  # Aplica a função `limpar_nome` na coluna 'nome_cliente' do DataFrame
+        df['nome_cliente'] = _executar(operacao('nome'), df['nome_cliente'], memo)  # Limpa a coluna 'nome_cliente' de uma vez
         print("✅ Nomes limpos e padronizados.") # Mensagem de sucesso
     except Exception as e:
         print(f"❌ Erro ao limpar nomes: {e}") # Em caso de erro, exibe a mensagem
@@ -31,18 +219,55 @@ def clean_names(df):
 #-------------------------#
 # 2. Validação de E-mails
 #-------------------------#
-def clean_emails(df): # Valida e trata os e-mails no DataFrame
-    try:
-        regex_email = r'^[\w\.-]+@[\w\.-]+\.\w+$' # Expressão regular para verificar se o e-mail tem um formato válido (ex: nome@dominio.com)
-
-        def tratar_email(email):  # Função auxiliar que será aplicada a cada e-mail individualmente
-            if pd.isna(email) or email.strip() == "":      # Verifica se o valor é nulo ou está em branco
-                return 'E-mail inválido ou não cadastrado' # Retorna mensagem padrão para valores ausentes
-            elif not re.match(regex_email, email):         # Se não combinar com o padrão da regex
-                return f'E-mail "{email}" inválido'        # Retorna uma mensagem específica com o valor original
-            return email                                   # Se for válido, retorna o e-mail original
 
-        df['email'] = df['email'].apply(tratar_email)      # Aplica a função `tratar_email` na coluna 'email' do DataFrame
+# Expressão regular pré-compilada para verificar se o e-mail tem um formato válido (ex: nome@dominio.com)
+REGEX_EMAIL = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+# A mesma regra para e-mails só com ASCII, na sintaxe do RE2 (onde \w não cobre letras acentuadas e
+# $ não aceita o \n final que o `re` aceita). E-mails com outros caracteres usam REGEX_EMAIL.
+REGEX_EMAIL_ASCII = r'^[A-Za-z0-9_.-]+@[A-Za-z0-9_.-]+\.[A-Za-z0-9_]+\n?$'
+
+# Função auxiliar que trata um único e-mail (versão célula a célula)
+def tratar_email(email):
+    if pd.isna(email) or email.strip() == "":      # Verifica se o valor é nulo ou está em branco
+        return 'E-mail inválido ou não cadastrado' # Retorna mensagem padrão para valores ausentes
+    elif not REGEX_EMAIL.match(email):             # Se não combinar com o padrão da regex
+        return f'E-mail "{email}" inválido'        # Retorna uma mensagem específica com o valor original
+    return email                                   # Se for válido, retorna o e-mail original
+
+# Valida a coluna de e-mails inteira com operações do acessor .str
+def tratar_emails_coluna(serie):
+    """Versão vetorizada de `tratar_email`, com o mesmo resultado de `serie.apply(tratar_email)`."""
+    if not _somente_texto(serie):
+        return serie.apply(tratar_email)
+
+    emails = serie.astype(object)
+    texto = _para_backend(serie)
+    ausente = (emails.isna() | texto.str.strip().eq("").fillna(True).astype(bool)).to_numpy()
+
+    if texto.dtype == object:
+        valido = texto.str.match(REGEX_EMAIL, na=False).to_numpy(dtype=bool)  # re.match, como na versão original
+    else:
+        # Caminho rápido no RE2 para os e-mails ASCII; só os demais passam pelo `re`
+        ascii_ = texto.str.fullmatch('[\x00-\x7f]*', na=False).to_numpy(dtype=bool)
+        valido = texto.str.match(REGEX_EMAIL_ASCII, na=False).to_numpy(dtype=bool) & ascii_
+        outros = ~ascii_ & ~ausente
+        if outros.any():
+            valido[outros] = emails[outros].str.match(REGEX_EMAIL, na=False).to_numpy(dtype=bool)
+
+    resultado = emails.copy()
+    invalido = ~valido & ~ausente
+    resultado[invalido] = 'E-mail "' + emails[invalido] + '" inválido'
+    resultado[ausente] = 'E-mail inválido ou não cadastrado'
+    return resultado
+
+# Conta quantos e-mails foram substituídos por uma mensagem de e-mail inválido
+def contar_emails_invalidos(df):
+    return int(df['email'].str.startswith('E-mail ', na=False).sum())
+
+def clean_emails(df, memo=None): # Valida e trata os e-mails no DataFrame
+    try:
+        df['email'] = _executar(operacao('email'), df['email'], memo)  # Valida a coluna 'email' de uma vez
         print("✅ E-mails validados e tratados.")         # Mensagem de sucesso
     except Exception as e:
         print(f"❌ Erro ao validar e-mails: {e}")         # Em caso de erro, exibe a mensagem
@@ -51,20 +276,24 @@ def clean_emails(df): # Valida e trata os e-mails no DataFrame
 # 3. Limpeza de Idades
 #-------------------------#
 
+# Função auxiliar que trata cada valor de idade individualmente
+def ajustar_idade(valor):
+    if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor está ausente ou é uma string vazia
+        return np.nan                               # Retorna NaN (valor nulo do NumPy)
+    try:
+        return int(float(valor))                    # Converte o valor para float e depois para inteiro
+    except (ValueError, TypeError):                 # Captura erros de conversão (ex: texto inválido)
+        return np.nan                               # Retorna NaN em caso de erro
+
+# Aplica `ajustar_idade` na coluna e converte para o tipo inteiro que aceita nulos (Int64)
+def converter_idades_coluna(serie):
+    return serie.apply(ajustar_idade).astype('Int64')
+
 # Limpa e padroniza a coluna de idades
-def clean_age(df):
+def clean_age(df, memo=None):
     try:
-        # Função auxiliar que trata cada valor de idade individualmente
-        def ajustar_idade(valor):
-            if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor está ausente ou é uma string vazia
-                return np.nan                               # Retorna NaN (valor nulo do NumPy)
-            try:
-                return int(float(valor))                    # Converte o valor para float e depois para inteiro
-            except (ValueError, TypeError):                 # Captura erros de conversão (ex: texto inválido)
-                return np.nan                               # Retorna NaN em caso de erro
-
-        # Aplica a função `ajustar_idade` na coluna 'idade' e converte a coluna para o tipo inteiro que aceita nulos (Int64)
-        df['idade'] = df['idade'].apply(ajustar_idade).astype('Int64')
+        # astype de novo porque, com memo, os resultados reaproveitados chegam como object
+        df['idade'] = _executar(operacao('idade'), df['idade'], memo).astype('Int64')
 
         print("✅ Idades limpas e padronizadas.")            # Mensagem de sucesso
     except Exception as e:
@@ -74,31 +303,73 @@ def clean_age(df):
 # 4. Formatação de Datas
 #-------------------------#
 
+# Lista de formatos possíveis para datas a serem reconhecidas (a ordem importa: 'dd/mm' vem antes de 'mm/dd')
+FORMATOS_DATA = ['%d/%m/%Y', '%Y/%m/%d', '%m/%d/%Y',
+                 '%d-%m-%Y', '%Y-%m-%d', '%m-%d-%Y']
+
+# Padrão de datas já no formato ISO (AAAA-MM-DD), que só podem casar com '%Y-%m-%d'
+REGEX_DATA_ISO = r'\d{4}-\d{2}-\d{2}'
+
+# Função auxiliar que tenta converter um único valor para data (versão célula a célula)
+def converter_data(valor):
+    if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou uma string vazia
+        return pd.NaT                             # Retorna um valor nulo de data (pd.NaT)
+    # Tenta converter o valor para data em cada um dos formatos possíveis
+    for formato in FORMATOS_DATA:
+        try:
+            return pd.to_datetime(valor, format=formato, errors='raise')  # Converte para data
+        except (ValueError, TypeError):  # Captura erros caso o formato não seja compatível
+            continue  # Continua tentando os próximos formatos
+    return pd.NaT  # Retorna NaT (Not a Time) se nenhum formato for compatível
+
+# Converte uma coluna inteira de uma vez, tentando cada formato uma única vez por coluna
+def converter_datas_coluna(serie):
+    """
+    Versão vetorizada de `converter_data`: cada formato é aplicado à coluna toda
+    com errors='coerce', e só as linhas ainda não convertidas seguem para o próximo formato.
+    O resultado é idêntico ao de `serie.apply(converter_data)`.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):  # Coluna já convertida: nada a fazer
+        return serie
+
+    valores = serie.astype(object)
+    resultado = pd.Series(pd.NaT, index=serie.index, name=serie.name, dtype='datetime64[ns]')
+
+    # Linhas nulas ou em branco permanecem como NaT
+    texto = valores.astype(str)
+    pendentes = valores.notna() & texto.str.strip().ne("")
+    if not pendentes.any():
+        return resultado
+
+    try:
+        # Caminho rápido: datas já em ISO só podem casar com '%Y-%m-%d', então não dependem da ordem dos formatos
+        iso = pendentes & texto.str.fullmatch(REGEX_DATA_ISO)
+        if iso.any():
+            resultado[iso] = pd.to_datetime(valores[iso], format='%Y-%m-%d', errors='coerce')
+            pendentes &= resultado.isna()
+
+        # Demais linhas: cada formato é tentado uma vez, na mesma ordem da versão célula a célula
+        for formato in FORMATOS_DATA:
+            if not pendentes.any():
+                break
+            convertidas = pd.to_datetime(valores[pendentes], format=formato, errors='coerce')
+            resultado[pendentes] = convertidas
+            pendentes &= resultado.isna()
+    except (ValueError, TypeError):
+        # Tipos mistos que o parser vetorizado não aceita: volta para a conversão célula a célula
+        return serie.apply(converter_data).astype('datetime64[ns]')
+
+    return resultado
+
 # Converte e padroniza as datas no DataFrame
-def clean_dates(df):
+def clean_dates(df, memo=None):
     try:
         # Identifica as colunas do DataFrame que contêm a palavra 'data' no nome (ignorando maiúsculas/minúsculas)
         colunas_data = [col for col in df.columns if 'data' in col.lower()]
-        
-        # Lista de formatos possíveis para datas a serem reconhecidas
-        formatos_possiveis = ['%d/%m/%Y', '%Y/%m/%d', '%m/%d/%Y', 
-                              '%d-%m-%Y', '%Y-%m-%d', '%m-%d-%Y']
-
-        # Função auxiliar que tenta converter um valor para data
-        def converter_data(valor):
-            if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou uma string vazia
-                return pd.NaT                             # Retorna um valor nulo de data (pd.NaT)
-            # Tenta converter o valor para data em cada um dos formatos possíveis
-            for formato in formatos_possiveis:
-                try:
-                    return pd.to_datetime(valor, format=formato, errors='raise')  # Converte para data
-                except (ValueError, TypeError):  # Captura erros caso o formato não seja compatível
-                    continue  # Continua tentando os próximos formatos
-            return pd.NaT  # Retorna NaT (Not a Time) se nenhum formato for compatível
-
-        # Aplica a função `converter_data` em todas as colunas que contêm 'data' no nome
+
+        # Converte cada coluna de uma vez (um parse por formato, e não por célula)
         for col in colunas_data:
-            df[col] = df[col].apply(converter_data)
+            df[col] = _executar(operacao('data'), df[col], memo)
 
         print("✅ Datas convertidas.")  # Mensagem de sucesso
     except Exception as e:
@@ -109,22 +380,57 @@ def clean_dates(df):
 # 5. Conversão de Moeda
 #-------------------------#
 
+# Formato final aceito depois da normalização (ex: "-1234.56")
+REGEX_NUMERO = re.compile(r'^-?\d+(?:\.\d+)?$')
+
+# Converte uma coluna de valores monetários em float, de forma vetorizada
+def converter_moeda_coluna(serie):
+    """
+    Converte valores como "R$ 933.6", "889,39", "1.234,56", "1,234.56" e números já numéricos em float.
+    O separador decimal é o último separador do valor, desde que apareça uma única vez;
+    os demais separadores são tratados como separadores de milhar ("1.234.567" -> 1234567).
+    Valores que não puderem ser convertidos viram NaN, sem interromper a coluna inteira.
+    Todas as etapas rodam em pyarrow.compute, em código nativo, sobre a coluna inteira.
+    """
+    if pd.api.types.is_numeric_dtype(serie):  # Coluna já numérica: só garante o tipo float
+        return serie.astype(float)
+
+    # Remove "R$" e espaços (inclusive o espaço não separável, comum em valores exportados do Excel)
+    texto = pa.array(serie.astype(str).mask(serie.isna(), None), type=pa.string())
+    for simbolo in ('R$', ' ', '\xa0'):
+        texto = pc.replace_substring(texto, simbolo, '')
+    texto = pc.utf8_trim_whitespace(texto)
+
+    # Quantas vezes cada separador aparece e a distância da última ocorrência até o fim do texto (-1 se ausente)
+    virgulas, pontos = pc.count_substring(texto, ','), pc.count_substring(texto, '.')
+    invertido = pc.utf8_reverse(texto)
+    dist_virgula, dist_ponto = pc.find_substring(invertido, ','), pc.find_substring(invertido, '.')
+
+    # O separador decimal é o último do valor e precisa aparecer uma única vez
+    virgula_decimal = pc.and_(pc.equal(virgulas, 1),
+                              pc.or_(pc.less(dist_ponto, 0), pc.less(dist_virgula, dist_ponto)))
+    ponto_decimal = pc.and_(pc.equal(pontos, 1),
+                            pc.or_(pc.less(dist_virgula, 0), pc.less(dist_ponto, dist_virgula)))
+
+    # Monta as três versões possíveis e escolhe a de cada linha pelas máscaras
+    sem_milhar = pc.replace_substring(pc.replace_substring(texto, '.', ''), ',', '')  # Tudo é milhar
+    com_virgula = pc.replace_substring(pc.replace_substring(texto, '.', ''), ',', '.')
+    com_ponto = pc.replace_substring(texto, ',', '')
+    normalizado = pc.if_else(virgula_decimal, com_virgula, pc.if_else(ponto_decimal, com_ponto, sem_milhar))
+
+    # Vírgula e ponto juntos sem um separador decimal claro (ex: "1.2.3,4,5") é ambíguo: vira NaN
+    misto = pc.and_(pc.and_(pc.greater(virgulas, 0), pc.greater(pontos, 0)),
+                    pc.invert(pc.or_(virgula_decimal, ponto_decimal)))
+    valido = pc.and_(pc.match_substring_regex(normalizado, REGEX_NUMERO.pattern), pc.invert(misto))
+
+    valores = pc.cast(pc.if_else(valido, normalizado, None), pa.float64())
+    return pd.Series(valores.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+
 # Converte valores monetários para formato numérico (float)
-def clean_currency(df):
+def clean_currency(df, memo=None):
     try:
-        # Função auxiliar que limpa e converte o valor monetário
-        def limpar_moeda(valor):
-            if pd.isnull(valor):  # Verifica se o valor é nulo
-                return np.nan  # Retorna um valor nulo (np.nan) se o valor for nulo
-            # Remove qualquer caractere que não seja número ou vírgula (ex: R$, espaços, etc.)
-            valor_limpo = re.sub(r'[^\d,]', '', str(valor))
-            # Substitui a vírgula (,) por ponto (.) para que seja compatível com o formato float
-            valor_limpo = valor_limpo.replace(',', '.')
-            # Converte a string limpa para um número decimal (float)
-            return float(valor_limpo)
-
-        # Aplica a função `limpar_moeda` na coluna 'valor_compra' do DataFrame
-        df['valor_compra'] = df['valor_compra'].apply(limpar_moeda)
+        # Converte a coluna 'valor_compra' de uma vez; valores inválidos viram NaN
+        df['valor_compra'] = _executar(operacao('moeda'), df['valor_compra'], memo)
 
         print("✅ Valores monetários convertidos.")  # Mensagem de sucesso
     except Exception as e:
@@ -135,17 +441,27 @@ def clean_currency(df):
 # 6. Padronização de IDs
 #-------------------------#
 
+# Função auxiliar que padroniza um único ID de produto (versão célula a célula)
+def padronizar_id(valor):
+    if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou está vazio
+        return np.nan  # Retorna um valor nulo (np.nan) se o valor for nulo ou vazio
+    return str(valor).strip().upper()  # Remove espaços antes e depois do valor, e transforma em maiúsculo
+
+# Padroniza a coluna de IDs inteira com operações do acessor .str
+def padronizar_ids_coluna(serie):
+    """Versão vetorizada de `padronizar_id`, com o mesmo resultado de `serie.apply(padronizar_id)`."""
+    nulos = serie.isna()
+    texto = serie if _somente_texto(serie) else serie.astype(str)  # astype(str) equivale a str(valor)
+    texto = _para_backend(texto)
+    ids = texto.str.strip().str.upper().astype(object)
+    ids = ids.mask(nulos | ids.eq(""), np.nan)
+    ids = _refazer_por_celula(ids, serie, _fora_latin1(texto) & ~nulos.to_numpy(), padronizar_id)
+    return ids.infer_objects()  # Coluna só com nulos vira float, como no apply
+
 # Padroniza os IDs de produtos (tornando-os em maiúsculo e tratando valores nulos)
-def clean_product_ids(df):
+def clean_product_ids(df, memo=None):
     try:
-        # Função auxiliar que realiza a padronização do valor do ID
-        def padronizar_id(valor):
-            if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou está vazio
-                return np.nan  # Retorna um valor nulo (np.nan) se o valor for nulo ou vazio
-            return str(valor).strip().upper()  # Remove espaços antes e depois do valor, e transforma em maiúsculo
-
-        # Aplica a função `padronizar_id` na coluna 'produto_id' do DataFrame
-        df['produto_id'] = df['produto_id'].apply(padronizar_id)
+        df['produto_id'] = _executar(operacao('id_produto'), df['produto_id'], memo)  # Padroniza a coluna 'produto_id' de uma vez
 
         print("✅ IDs de produtos padronizados.")  # Mensagem de sucesso indicando que a padronização foi realizada
     except Exception as e:
@@ -156,30 +472,40 @@ def clean_product_ids(df):
 # 7. Padroniza valor 'ativo'
 #-------------------------#
 
+# Valores que serão considerados como "True" e "False" (definidos uma única vez)
+VALORES_TRUE = frozenset({"1", "sim", "true", "yes"})
+VALORES_FALSE = frozenset({"0", "não", "no", "false"})
+MAPA_ATIVO = {**{v: True for v in VALORES_TRUE}, **{v: False for v in VALORES_FALSE}}
+
+# Função auxiliar que padroniza um único valor de status (versão célula a célula)
+def padronizar_ativo(valor):
+    if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou está vazio
+        return np.nan  # Retorna um valor nulo (np.nan) se o valor for nulo ou vazio
+
+    valor_str = str(valor).strip().lower()  # Converte o valor para uma string minúscula e remove espaços
+
+    # Verifica se o valor está entre os valores de "True" e retorna True
+    if valor_str in VALORES_TRUE:
+        return True
+    # Verifica se o valor está entre os valores de "False" e retorna False
+    elif valor_str in VALORES_FALSE:
+        return False
+    return np.nan  # Retorna np.nan se o valor não for um valor válido para "True" ou "False"
+
+# Padroniza a coluna de status inteira com um único mapeamento
+def padronizar_ativos_coluna(serie):
+    """Versão vetorizada de `padronizar_ativo`, com o mesmo resultado de `serie.apply(padronizar_ativo)`."""
+    texto = _para_backend(serie.astype(str))
+    tokens = texto.str.strip().str.lower().astype(object)
+    status = tokens.map(MAPA_ATIVO).astype(object)  # Tokens desconhecidos viram NaN
+    status = status.mask(serie.isna(), np.nan)
+    status = _refazer_por_celula(status, serie, _fora_latin1(texto) & serie.notna().to_numpy(), padronizar_ativo)
+    return status.infer_objects()  # Sem nulos, a coluna fica bool, como no apply
+
 # Padroniza o status de "ativo" (converte para valores booleanos ou nulos)
-def clean_active_status(df):
+def clean_active_status(df, memo=None):
     try:
-        # Função auxiliar que padroniza o valor do status de ativo
-        def padronizar_ativo(valor):
-            if pd.isna(valor) or str(valor).strip() == "":  # Verifica se o valor é nulo ou está vazio
-                return np.nan  # Retorna um valor nulo (np.nan) se o valor for nulo ou vazio
-
-            # Define os valores que serão considerados como "True" e "False"
-            valores_true = {"1", "sim", "true", "yes"}
-            valores_false = {"0", "não", "no", "false"}
-
-            valor_str = str(valor).strip().lower()  # Converte o valor para uma string minúscula e remove espaços
-
-            # Verifica se o valor está entre os valores de "True" e retorna True
-            if valor_str in valores_true:
-                return True
-            # Verifica se o valor está entre os valores de "False" e retorna False
-            elif valor_str in valores_false:
-                return False
-            return np.nan  # Retorna np.nan se o valor não for um valor válido para "True" ou "False"
-
-        # Aplica a função `padronizar_ativo` na coluna 'ativo' do DataFrame
-        df['ativo'] = df['ativo'].apply(padronizar_ativo)
+        df['ativo'] = _executar(operacao('ativo'), df['ativo'], memo)  # Padroniza a coluna 'ativo' de uma vez
 
         print("✅ Status 'ativo' padronizado.")  # Mensagem de sucesso indicando que a padronização foi realizada
     except Exception as e:
@@ -190,23 +516,44 @@ def clean_active_status(df):
 # 8. Geração de ID Cliente
 #-------------------------#
 
+# Namespace fixo dos UUIDs determinísticos: a mesma chave gera sempre o mesmo cliente_id
+NAMESPACE_CLIENTES = uuid.uuid5(uuid.NAMESPACE_DNS, 'clientes_limpos.tamires_abarca')
+
+# Gera o UUIDv5 de cada linha a partir das colunas-chave da deduplicação
+def gerar_ids_deterministicos(df, colunas=None):
+    """Retorna uma lista de UUIDv5 (em texto) calculados a partir das colunas-chave de cada linha."""
+    colunas = colunas or COLUNAS_DUPLICATAS
+    chaves = df[colunas].astype(str).mask(df[colunas].isna(), '')  # Nulos entram como texto vazio
+    return [str(uuid.uuid5(NAMESPACE_CLIENTES, '|'.join(linha))) for linha in chaves.itertuples(index=False)]
+
 # Função que gera um identificador único para cada cliente, utilizando UUID
-def padronizar_cliente_id(df):
+def padronizar_cliente_id(df, deterministico=False, colunas=None):
     """
     Gera IDs únicos para os clientes na coluna 'cliente_id' usando UUID.
     Garante que os valores sejam únicos no DataFrame e estão prontos para subir ao SQL Server.
+    Com deterministico=True, usa UUIDv5 das colunas-chave, de modo que a mesma compra
+    recebe o mesmo 'cliente_id' em todas as execuções (necessário para a carga incremental).
+    `colunas` troca as colunas-chave do UUIDv5 (padrão: COLUNAS_DUPLICATAS).
     """
     try:
         # Verifica se o DataFrame foi fornecido e se não está vazio
         if df is None or df.empty:
             raise ValueError("DataFrame está vazio ou não foi fornecido.")  # Levanta um erro caso o DataFrame esteja vazio
 
-        # Geração de UUIDs únicos para cada cliente
-        cliente_ids = [str(uuid.uuid4()) for _ in range(len(df))]  # Cria uma lista de UUIDs convertidos para string
+        if deterministico:
+            cliente_ids = gerar_ids_deterministicos(df, colunas)
 
-        # Verifica se há duplicatas nos UUIDs gerados (é improvável, mas é uma verificação de segurança)
-        if len(cliente_ids) != len(set(cliente_ids)):
-            raise ValueError("Colisão de UUIDs detectada. Refaça a geração.")  # Levanta um erro caso haja duplicatas
+            # IDs repetidos aqui significam linhas duplicadas que ainda não foram removidas
+            repetidos = len(cliente_ids) - len(set(cliente_ids))
+            if repetidos:
+                print(f"⚠️ {repetidos} 'cliente_id' repetidos: existem linhas duplicadas nas colunas-chave.")
+        else:
+            # Geração de UUIDs únicos para cada cliente
+            cliente_ids = [str(uuid.uuid4()) for _ in range(len(df))]  # Cria uma lista de UUIDs convertidos para string
+
+            # Verifica se há duplicatas nos UUIDs gerados (é improvável, mas é uma verificação de segurança)
+            if len(cliente_ids) != len(set(cliente_ids)):
+                raise ValueError("Colisão de UUIDs detectada. Refaça a geração.")  # Levanta um erro caso haja duplicatas
 
         # Adiciona a coluna 'cliente_id' ao DataFrame com os UUIDs gerados
         df['cliente_id'] = cliente_ids
@@ -221,22 +568,52 @@ def padronizar_cliente_id(df):
 # 9. Remoção de Duplicatas
 #-------------------------#
 
+# Colunas que definem quando duas linhas são consideradas a mesma compra
+COLUNAS_DUPLICATAS = ['nome_cliente', 'email', 'produto_id', 'valor_compra']
+
+# Calcula um hash de 64 bits por linha a partir das colunas-chave
+def hash_chaves(df, colunas=COLUNAS_DUPLICATAS, normalizar=False):
+    """
+    Retorna um array uint64 com o hash das colunas-chave de cada linha (None e NaN contam como o mesmo valor).
+    Com normalizar=True, maiúsculas/minúsculas e espaços extras são ignorados ("Ana  Lima" == "ana lima").
+    """
+    chaves = df[colunas]
+
+    # Uma coluna só com nulos vira float em alguns blocos; como object, seus nulos têm o mesmo hash em todos
+    vazias = {col: object for col in colunas if chaves[col].dtype != object and chaves[col].isna().all()}
+    if vazias:
+        chaves = chaves.astype(vazias)
+
+    if normalizar:
+        texto = [col for col in colunas if chaves[col].dtype == object]
+        chaves = chaves.assign(**{
+            col: chaves[col].str.lower().str.replace(REGEX_ESPACOS, ' ', regex=True).str.strip() for col in texto
+        })
+    return pd.util.hash_pandas_object(chaves, index=False).to_numpy()
+
 # Função que identifica e remove duplicatas no DataFrame, com base em múltiplas colunas.
-def remove_duplicates(df):
+def remove_duplicates(df, normalizar_chaves=False, amostras=5, colunas=COLUNAS_DUPLICATAS):
+    """
+    Remove as linhas repetidas nas colunas-chave (`colunas`), mantendo a primeira ocorrência.
+    As colunas-chave são reduzidas a um único hash de 64 bits por linha, calculado uma só vez.
+    Em vez de imprimir todas as duplicatas, mostra a contagem e até `amostras` exemplos.
+    Retorna um novo DataFrame: use sempre o valor retornado (df = remove_duplicates(df)).
+    """
     try:
-        # Identificar duplicatas com base nas colunas 'nome_cliente', 'email', 'produto_id' e 'valor_compra'.
-        # O parâmetro keep=False faz com que todas as duplicatas sejam marcadas, não apenas a última ou a primeira.
-        duplicatas = df[df.duplicated(subset=['nome_cliente', 'email', 'produto_id', 'valor_compra'], keep=False)]
-        
+        # Marca como duplicada toda linha cujo hash já apareceu antes (keep='first')
+        duplicadas = pd.Series(hash_chaves(df, colunas, normalizar_chaves)).duplicated(keep='first').to_numpy()
+        total = int(duplicadas.sum())
+
         # Verifica se existem duplicatas no DataFrame
-        if not duplicatas.empty:
-            print("⚠️ Linhas duplicadas encontradas:")  # Mensagem de alerta caso existam duplicatas
-            print(duplicatas)  # Exibe as duplicatas encontradas no DataFrame
+        if total:
+            print(f"⚠️ {total} linhas duplicadas encontradas. Exemplos:")  # Mensagem de alerta com a contagem
+            print(df.loc[duplicadas, colunas].head(amostras))   # Só algumas linhas, para conferência
         else:
             print("✅ Nenhuma duplicata encontrada.")  # Mensagem de sucesso caso não haja duplicatas
+            return df
 
-        # Remove as duplicatas, mantendo apenas a primeira ocorrência em cada conjunto de duplicados
-        df = df.drop_duplicates(subset=['nome_cliente', 'email', 'produto_id', 'valor_compra'], keep='first')
+        # Mantém apenas a primeira ocorrência de cada chave (take não marca o resultado como cópia de df)
+        df = df.take(np.flatnonzero(~duplicadas))
 
         print("✅ Duplicatas removidas.")  # Mensagem de sucesso indicando que as duplicatas foram removidas
         return df  # Retorna o DataFrame após a remoção das duplicatas
@@ -245,34 +622,100 @@ def remove_duplicates(df):
         print(f"❌ Erro ao remover duplicatas: {e}")  # Em caso de erro, exibe uma mensagem indicando o que ocorreu
         return df  # Retorna o DataFrame original em caso de erro
 
+# Conjunto dos hashes já vistos no modo streaming (8 bytes por chave única)
+class ConjuntoHashes:
+    """
+    Guarda os hashes em níveis ordenados de tamanhos crescentes: cada bloco novo vira um nível e
+    níveis de tamanho parecido são fundidos (como um contador binário). A busca é um searchsorted
+    por nível, e cada hash é fundido O(log n) vezes no total, em vez de o conjunto inteiro ser
+    reordenado e copiado a cada bloco.
+    """
+
+    def __init__(self, hashes=None):
+        self.niveis = []
+        if hashes is not None and len(hashes):
+            self.adicionar(np.unique(np.asarray(hashes, dtype=np.uint64)))
+
+    def __len__(self):
+        return sum(len(nivel) for nivel in self.niveis)
+
+    def contem(self, hashes):
+        """Array booleano: True para cada hash que já está no conjunto."""
+        ordem = np.argsort(hashes)
+        ordenados = hashes[ordem]  # Buscas em ordem crescente acessam a memória de forma sequencial
+        achados = np.zeros(len(hashes), dtype=bool)
+        for nivel in self.niveis:
+            posicoes = np.minimum(np.searchsorted(nivel, ordenados), len(nivel) - 1)
+            achados[ordem] |= nivel[posicoes] == ordenados
+        return achados
+
+    def adicionar(self, hashes):
+        """Acrescenta hashes únicos que ainda não estão no conjunto."""
+        if not len(hashes):
+            return
+        novo = np.sort(np.asarray(hashes, dtype=np.uint64))
+        while self.niveis and len(self.niveis[-1]) <= len(novo):
+            # Os dois níveis já estão ordenados: basta intercalar o menor no maior
+            nivel = self.niveis.pop()
+            novo = np.insert(nivel, np.searchsorted(nivel, novo), novo)
+        self.niveis.append(novo)
+
+# Remove duplicatas de um bloco considerando também os blocos já processados (modo streaming)
+def remove_duplicates_incremental(df, hashes_vistos, normalizar_chaves=False, colunas=COLUNAS_DUPLICATAS):
+    """
+    Remove do bloco as linhas repetidas dentro dele e as que já apareceram em blocos anteriores.
+    `hashes_vistos` é um ConjuntoHashes (um array de uint64 também é aceito) e é devolvido atualizado.
+    Retorna (df_sem_duplicatas, hashes_vistos).
+    """
+    if not isinstance(hashes_vistos, ConjuntoHashes):
+        hashes_vistos = ConjuntoHashes(hashes_vistos)
+    try:
+        hashes = hash_chaves(df, colunas, normalizar_chaves)
+
+        # Duplicada se já foi vista em outro bloco ou se repete dentro do próprio bloco
+        repetidas = hashes_vistos.contem(hashes) | pd.Series(hashes).duplicated(keep='first').to_numpy()
+
+        if repetidas.any():
+            print(f"⚠️ {int(repetidas.sum())} linhas duplicadas removidas do bloco.")
+
+        df = df[~repetidas]
+        hashes_vistos.adicionar(hashes[~repetidas])
+        return df, hashes_vistos
+
+    except Exception as e:
+        print(f"❌ Erro ao remover duplicatas do bloco: {e}")
+        return df, hashes_vistos
+
 #-------------------------#
 # 10. Padronizar Nulos para SQL
 #-------------------------#
 
+# Padroniza os nulos de uma única coluna, de acordo com o tipo de dados
+def padronizar_nulos_coluna(serie):
+    # Verifica se a coluna é do tipo datetime (data e hora)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        # Para valores nulos na coluna de data, substitui por None (valor nulo compatível com SQL)
+        return serie.where(serie.notna(), None)
+
+    # Verifica se a coluna é do tipo inteiro ou ponto flutuante (numérico)
+    elif pd.api.types.is_integer_dtype(serie) or pd.api.types.is_float_dtype(serie):
+        # Se a coluna for numérica, mantém o valor como está (não altera os nulos)
+        return serie
+
+    # Verifica se a coluna é do tipo booleano
+    elif pd.api.types.is_bool_dtype(serie):
+        # Para valores booleanos, mantém os valores nulos como estão
+        return serie
+
+    # Para qualquer outro tipo de dado (como strings, objetos, etc.), substitui os nulos por None
+    return serie.where(serie.notna(), None)
+
 # Função que padroniza os valores nulos de acordo com os tipos de dados para garantir compatibilidade com o SQL.
 def padronizar_nulos_para_sql(df):
     try:
         # Itera sobre cada coluna do DataFrame
         for col in df.columns:
-            # Verifica se a coluna é do tipo datetime (data e hora)
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                # Para valores nulos na coluna de data, substitui por None (valor nulo compatível com SQL)
-                df[col] = df[col].where(df[col].notna(), None)
-            
-            # Verifica se a coluna é do tipo inteiro ou ponto flutuante (numérico)
-            elif pd.api.types.is_integer_dtype(df[col]) or pd.api.types.is_float_dtype(df[col]):
-                # Se a coluna for numérica, mantém o valor como está (não altera os nulos)
-                df[col] = df[col]
-            
-            # Verifica se a coluna é do tipo booleano
-            elif pd.api.types.is_bool_dtype(df[col]):
-                # Para valores booleanos, mantém os valores nulos como estão
-                df[col] = df[col]
-            
-            # Para qualquer outro tipo de dado (como strings, objetos, etc.)
-            else:
-                # Para valores nulos em outras colunas, substitui por None
-                df[col] = df[col].where(df[col].notna(), None)
+            df[col] = padronizar_nulos_coluna(df[col])
 
         # Mensagem de sucesso indicando que os nulos foram padronizados
         print("✅ Nulos padronizados para envio ao SQL.")
@@ -287,3 +730,108 @@ def padronizar_nulos_para_sql(df):
         # Retorna o DataFrame original em caso de erro
         return df
 
+
+#-------------------------#
+# 11. Backends de execução
+#-------------------------#
+
+# Cada backend implementa as limpezas por coluna (recebem e devolvem uma Series), pelo nome da operação.
+# 'pandas' são as funções deste arquivo; 'arrow' (backend_arrow.py) roda as mesmas regras em pyarrow.compute.
+BACKENDS = {
+    'pandas': {
+        'nome': limpar_nomes_coluna,
+        'email': tratar_emails_coluna,
+        'idade': converter_idades_coluna,
+        'data': converter_datas_coluna,
+        'moeda': converter_moeda_coluna,
+        'id_produto': padronizar_ids_coluna,
+        'ativo': padronizar_ativos_coluna,
+    },
+}
+
+# Backend usado pelas funções clean_* e pelo pipeline declarativo
+BACKEND_LIMPEZA = 'pandas'
+
+def registrar_backend(nome, operacoes):
+    """Registra um backend; operações que ele não implementar continuam usando a versão pandas."""
+    BACKENDS[nome] = operacoes
+
+def definir_backend(nome):
+    """Escolhe o backend das limpezas ('pandas' ou 'arrow')."""
+    global BACKEND_LIMPEZA
+    if nome == 'arrow' and nome not in BACKENDS:
+        import backend_arrow  # noqa: F401 -- registra o backend ao ser importado
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend '{nome}' desconhecido. Disponíveis: {sorted(BACKENDS)}.")
+    BACKEND_LIMPEZA = nome
+
+# Função que executa a operação no backend escolhido
+def operacao(nome):
+    return BACKENDS[BACKEND_LIMPEZA].get(nome, BACKENDS['pandas'][nome])
+
+
+#-------------------------#
+# 12. Validação e quarentena
+#-------------------------#
+
+# Colunas validadas, na ordem dos bits do código de erro (nome_cliente = 1, email = 2, idade = 4, ...)
+COLUNAS_VALIDADAS = ['nome_cliente', 'email', 'idade', 'data_compra', 'valor_compra', 'produto_id', 'ativo']
+
+# Guarda os valores originais das colunas validadas, antes da limpeza (que altera o DataFrame)
+def copiar_brutos(df, colunas=COLUNAS_VALIDADAS):
+    return df[[col for col in dict.fromkeys(colunas) if col in df.columns]].copy()
+
+# Valores que a limpeza não conseguiu aproveitar: nulos, textos vazios (ex: nome "A.") e mensagens de e-mail
+def _falhou(serie):
+    falhou = serie.isna()
+    if serie.dtype == object or isinstance(serie.dtype, pd.StringDtype):
+        texto = serie.astype(object).where(~falhou, '')
+        falhou |= texto.eq('') | (texto.str.startswith('E-mail ', na=False) if serie.name == 'email' else False)
+    return falhou.astype(bool)
+
+def separar_rejeitados(bruto, df, origens=None):
+    """
+    Compara os valores originais (`bruto`, de copiar_brutos) com o DataFrame já limpo e grava em
+    df['codigo_erro'] um código por linha: a soma de 2**i de cada coluna i de `origens` que estava
+    preenchida na entrada e foi rejeitada na limpeza (0 = linha sem erros). Os valores rejeitados
+    (e as mensagens de e-mail inválido) viram nulos, para as colunas ficarem só com dados válidos.
+    `origens` mapeia coluna limpa -> coluna original (padrão: COLUNAS_VALIDADAS, com o mesmo nome).
+    Retorna a quarentena: linha de origem, código, colunas rejeitadas e valores originais das linhas com erro.
+    """
+    origens = origens or {col: col for col in COLUNAS_VALIDADAS}
+    origens = {destino: origem for destino, origem in origens.items() if destino in df.columns and origem in bruto.columns}
+    codigos = np.zeros(len(df), dtype=np.min_scalar_type(2 ** max(len(origens), 1) - 1))
+
+    for bit, (destino, origem) in enumerate(origens.items()):
+        valores = bruto[origem].astype(object)
+        preenchido = valores.notna() & valores.astype(str).str.strip().ne('')
+        falhou = _falhou(df[destino])
+        codigos[(preenchido & falhou).to_numpy()] |= 1 << bit
+        if falhou.any():
+            df[destino] = df[destino].mask(falhou)
+    df['codigo_erro'] = codigos
+
+    # Quarentena: só as linhas com erro, com os valores como vieram na entrada
+    com_erro = codigos != 0
+    quarentena = bruto[com_erro].astype(object)
+    nomes = list(origens)
+    quarentena.insert(0, 'linha', bruto.index[com_erro])
+    quarentena.insert(1, 'codigo_erro', codigos[com_erro])
+    quarentena.insert(2, 'colunas_rejeitadas', [', '.join(nomes[bit] for bit in range(len(nomes)) if codigo >> bit & 1)
+                                                for codigo in codigos[com_erro]])
+    return quarentena.reset_index(drop=True)
+
+# Quantas linhas foram rejeitadas em cada coluna (somável entre blocos, no modo streaming)
+def contar_rejeitados(quarentena):
+    return quarentena['colunas_rejeitadas'].str.split(', ').explode().value_counts()
+
+def exibir_rejeitados(contagem, rejeitadas, total_linhas):
+    """Resumo da validação: linhas rejeitadas no total e por coluna, com o percentual sobre as linhas lidas."""
+    if not rejeitadas:
+        print(f"✅ Validação: nenhuma das {total_linhas} linhas teve valores rejeitados.")
+        return
+    resumo = pd.DataFrame({'rejeitadas': contagem.astype(int),
+                           'percentual': (100 * contagem / max(total_linhas, 1)).round(2)})
+    resumo.index.name = 'coluna'
+    print(f"⚠️ Validação: {rejeitadas} de {total_linhas} linhas com valores rejeitados (enviadas à quarentena):")
+    print(resumo.to_string())
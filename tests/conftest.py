@@ -0,0 +1,18 @@
+#-------------------------------------------
+# Configuração comum dos testes
+#-------------------------------------------
+import os
+import sys
+
+import pytest
+
+# Os módulos do projeto ficam em src/ e se importam pelo nome (como em main.py)
+PASTA_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, PASTA_SRC)
+
+# Arquivo de exemplo com os dados reais de clientes
+CSV_EXEMPLO = os.path.join(os.path.dirname(PASTA_SRC), 'data', 'dados_clientes_sujos_3000_v2.csv')
+
+@pytest.fixture(scope='session')
+def csv_exemplo():
+    return CSV_EXEMPLO
@@ -0,0 +1,79 @@
+#-------------------------------------------
+# Testes de conformidade dos backends de limpeza: 'arrow' deve dar o mesmo resultado que 'pandas'
+#-------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import tratar_CSV
+from acesso_CSV import load_data
+from gerar_dados import gerar_bloco
+from tratar_CSV import BACKENDS, definir_backend
+
+definir_backend('arrow')    # Registra o backend arrow (importa backend_arrow)
+definir_backend('pandas')
+
+# Coluna do arquivo -> operação aplicada a ela
+COLUNAS = {
+    'nome_cliente': 'nome', 'email': 'email', 'idade': 'idade', 'data_compra': 'data',
+    'valor_compra': 'moeda', 'produto_id': 'id_produto', 'ativo': 'ativo',
+}
+
+# Textos que exercitam as diferenças entre o Arrow e o Python (Unicode, espaços, números e datas incomuns)
+CASOS_LIMITE = ['', ' ', '\u3000', None, 'Sr. joão', 'straße', 'İstanbul', 'ǆemal', 'µ', "d'ávila", ' \x1c ana\x1f ',
+                'á@b.com', 'a@b.com\n', 'a_b@c-d.e_f', ' 53 ', '-3.7', '+4', '1e2', '1_0', '٥', '.5', '9e18',
+                '31/02/2023', '2023/1/2', '02/31/2023', '01/02/1600', '29/02/2024', ' 01/02/2023', '1/2/23',
+                'SIM', ' Não ', 'NÃO', 'não\u3000', 'abc-1', ' x9 ']
+
+@pytest.fixture(scope='module')
+def dados_exemplo(csv_exemplo):
+    return {'load_data': load_data(csv_exemplo), 'read_csv': pd.read_csv(csv_exemplo)}
+
+@pytest.fixture(scope='module')
+def dados_gerados():
+    return gerar_bloco(20_000, np.random.default_rng(42))
+
+def comparar(operacao, serie):
+    pd.testing.assert_series_equal(BACKENDS['pandas'][operacao](serie), BACKENDS['arrow'][operacao](serie))
+
+#---------------------------------------------------
+# Operação por operação
+#---------------------------------------------------
+@pytest.mark.parametrize('leitura', ['load_data', 'read_csv'])
+@pytest.mark.parametrize('coluna', sorted(COLUNAS))
+def test_arquivo_de_exemplo(dados_exemplo, leitura, coluna):
+    comparar(COLUNAS[coluna], dados_exemplo[leitura][coluna])
+
+@pytest.mark.parametrize('coluna', sorted(COLUNAS))
+def test_dados_gerados(dados_gerados, coluna):
+    comparar(COLUNAS[coluna], dados_gerados[coluna])
+
+@pytest.mark.parametrize('dtype', [object, 'string[pyarrow]'])
+@pytest.mark.parametrize('operacao', sorted(set(COLUNAS.values())))
+def test_casos_limite(operacao, dtype):
+    casos = pd.Series(CASOS_LIMITE * 3, dtype=object)
+    comparar(operacao, casos if dtype is object else casos.dropna().astype(dtype))
+
+def test_serie_vazia():
+    for operacao in COLUNAS.values():
+        comparar(operacao, pd.Series([], dtype='string[pyarrow]'))
+
+#---------------------------------------------------
+# Limpeza completa (funções clean_*) com cada backend
+#---------------------------------------------------
+def limpar(df, backend):
+    original = tratar_CSV.BACKEND_LIMPEZA
+    definir_backend(backend)
+    try:
+        for etapa in (tratar_CSV.clean_names, tratar_CSV.clean_emails, tratar_CSV.clean_age,
+                      tratar_CSV.clean_dates, tratar_CSV.clean_currency, tratar_CSV.clean_product_ids,
+                      tratar_CSV.clean_active_status):
+            etapa(df)
+    finally:
+        definir_backend(original)
+    return df
+
+def test_limpeza_completa_do_arquivo_de_exemplo(csv_exemplo):
+    pd.testing.assert_frame_equal(limpar(load_data(csv_exemplo), 'pandas'), limpar(load_data(csv_exemplo), 'arrow'))
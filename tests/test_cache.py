@@ -0,0 +1,22 @@
+#-------------------------------------------
+# Testes do registro de envios do cache (cache.ja_enviado / cache.marcar_enviado)
+#-------------------------------------------
+from cache import ja_enviado, marcar_enviado
+
+def test_outro_resultado_enviado_invalida_o_anterior(tmp_path):
+    pasta = str(tmp_path / 'cache')
+    marcar_enviado(pasta, 'A', 'schema.tabela')
+    assert ja_enviado(pasta, 'A', 'schema.tabela')
+
+    marcar_enviado(pasta, 'B', 'schema.tabela')  # Arquivo B substitui a tabela
+    assert not ja_enviado(pasta, 'A', 'schema.tabela')
+    assert ja_enviado(pasta, 'B', 'schema.tabela')
+
+def test_envio_sem_chave_invalida_o_destino(tmp_path):
+    pasta = str(tmp_path / 'cache')
+    marcar_enviado(pasta, 'A', 'schema.tabela')
+    marcar_enviado(pasta, 'A', 'schema.outra')
+    marcar_enviado(pasta, None, 'schema.tabela')  # Ex: streaming, ingestão ou upload sem cache
+    assert not ja_enviado(pasta, 'A', 'schema.tabela')
+    assert ja_enviado(pasta, 'A', 'schema.outra')
+    assert not ja_enviado(pasta, None, 'schema.tabela')
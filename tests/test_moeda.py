@@ -0,0 +1,74 @@
+#-------------------------------------------
+# Testes da conversão de valores monetários (tratar_CSV.converter_moeda_coluna)
+#-------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from tratar_CSV import converter_moeda_coluna, clean_currency
+
+#---------------------------------------------------
+# Padrões encontrados no arquivo de exemplo
+#---------------------------------------------------
+
+# (linha do arquivo de exemplo, valor original, float esperado): um exemplo de cada padrão do arquivo
+LINHAS_EXEMPLO = [
+    (0, 'R$ 933.6', 933.6),
+    (1, 'R$ 990.18', 990.18),
+    (5, '889,39', 889.39),
+    (57, '622,4', 622.4),
+    (24, '21,89', 21.89),
+    (12, '9008.35', 9008.35),
+    (3, '9285.5', 9285.5),
+    (7, '199.52', 199.52),
+    (32, 'R$ 8.13', 8.13),
+]
+
+@pytest.mark.parametrize('linha, original, esperado', LINHAS_EXEMPLO)
+def test_padroes_do_arquivo_de_exemplo(csv_exemplo, linha, original, esperado):
+    serie = pd.read_csv(csv_exemplo)['valor_compra']
+    assert serie[linha] == original
+    assert converter_moeda_coluna(serie).iloc[linha] == pytest.approx(esperado)
+
+def test_arquivo_de_exemplo_sem_perdas(csv_exemplo):
+    serie = pd.read_csv(csv_exemplo)['valor_compra']
+    convertido = converter_moeda_coluna(serie)
+    assert convertido.dtype == np.float64
+    assert convertido.notna().equals(serie.notna())  # Nenhum valor preenchido vira NaN
+    # "R$ 933.6" deve virar 933.6 (e não 9336.0, como na versão que removia todos os pontos)
+    assert (convertido < 10_000).all()
+
+#---------------------------------------------------
+# Separadores de milhar e decimal
+#---------------------------------------------------
+@pytest.mark.parametrize('original, esperado', [
+    ('R$ 933.6', 933.6),
+    ('889,39', 889.39),
+    ('1.234,56', 1234.56),
+    ('1,234.56', 1234.56),
+    ('R$ 1.200,00', 1200.0),
+    ('1.234.567', 1234567.0),
+    ('R$\xa01.234,56', 1234.56),
+    ('-12,5', -12.5),
+])
+def test_formatos_de_texto(original, esperado):
+    assert converter_moeda_coluna(pd.Series([original])).iloc[0] == pytest.approx(esperado)
+
+def test_entrada_numerica():
+    assert converter_moeda_coluna(pd.Series([10, 25])).tolist() == [10.0, 25.0]
+    assert converter_moeda_coluna(pd.Series([933.6, np.nan])).iloc[0] == 933.6
+    assert converter_moeda_coluna(pd.Series([1, 2])).dtype == np.float64
+
+@pytest.mark.parametrize('original', ['abc', '', 'R$', '1.2.3,4,5', '12a', None])
+def test_valores_invalidos_viram_nan(original):
+    assert np.isnan(converter_moeda_coluna(pd.Series([original, '10,5'], dtype=object)).iloc[0])
+
+def test_invalido_nao_interrompe_a_coluna():
+    convertido = converter_moeda_coluna(pd.Series(['R$ 10.5', 'lixo', '7,25']))
+    assert convertido.iloc[0] == 10.5 and np.isnan(convertido.iloc[1]) and convertido.iloc[2] == 7.25
+
+def test_clean_currency_no_dataframe():
+    df = pd.DataFrame({'valor_compra': ['R$ 933.6', '1.234,56', 'lixo']})
+    clean_currency(df)
+    assert df['valor_compra'].iloc[:2].tolist() == [933.6, 1234.56]
+    assert np.isnan(df['valor_compra'].iloc[2])
@@ -0,0 +1,48 @@
+#-------------------------------------------
+# Testes da execução por valores distintos com memo entre blocos (tratar_CSV.aplicar_por_distintos)
+#-------------------------------------------
+import pandas as pd
+import pytest
+
+from acesso_CSV import load_data_chunks
+from especificacao import ESPECIFICACAO_CLIENTES, esquema_leitura, planejar, tratar_colunas
+from tratar_CSV import BACKENDS, MemoDistintos, aplicar_por_distintos
+
+# Operação -> coluna do arquivo de exemplo em que ela é aplicada
+COLUNAS = {
+    'nome': 'nome_cliente', 'email': 'email', 'idade': 'idade', 'data': 'data_compra',
+    'moeda': 'valor_compra', 'id_produto': 'produto_id', 'ativo': 'ativo',
+}
+
+def blocos_exemplo(csv_exemplo, tamanho=500):
+    esquema = esquema_leitura(ESPECIFICACAO_CLIENTES, pd.read_csv(csv_exemplo, nrows=0).columns)
+    return list(load_data_chunks(csv_exemplo, tamanho, esquema))
+
+@pytest.mark.parametrize('nome_operacao', sorted(COLUNAS))
+def test_mesmo_resultado_e_dtype_em_todos_os_blocos(csv_exemplo, nome_operacao):
+    funcao, coluna = BACKENDS['pandas'][nome_operacao], COLUNAS[nome_operacao]
+    memo = MemoDistintos()
+    for bloco in blocos_exemplo(csv_exemplo):
+        esperado = funcao(bloco[coluna])
+        resultado = aplicar_por_distintos(bloco[coluna], funcao, memo)
+        assert resultado.dtype == esperado.dtype
+        pd.testing.assert_series_equal(resultado, esperado)
+
+def test_bloco_todo_no_memo_mantem_o_dtype():
+    funcao = BACKENDS['pandas']['idade']
+    memo = MemoDistintos()
+    primeiro = aplicar_por_distintos(pd.Series(['30', '41', 'abc'], name='idade'), funcao, memo)
+    repetido = aplicar_por_distintos(pd.Series(['41', '30'], name='idade'), funcao, memo)  # Nada a calcular
+    assert primeiro.dtype == repetido.dtype == 'Int64'
+    assert repetido.tolist() == [41, 30]
+
+def test_especificacao_com_tipos_estaveis_no_streaming(csv_exemplo):
+    memo = MemoDistintos()
+    dtypes = []
+    for bloco in blocos_exemplo(csv_exemplo):
+        tratado = tratar_colunas(bloco, planejar(ESPECIFICACAO_CLIENTES, bloco.columns), memo)
+        dtypes.append(tratado.dtypes.to_dict())
+    assert all(d == dtypes[0] for d in dtypes)
+    assert dtypes[0]['idade'] == 'Int64'
+    assert dtypes[0]['valor_compra'] == 'float64'
+    assert dtypes[0]['data_compra'] == 'datetime64[ns]'
@@ -0,0 +1,96 @@
+#-------------------------------------------
+# Testes da carga no banco (conexao_banco), em um SQLite local no lugar do SQL Server
+#-------------------------------------------
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import conexao_banco
+from conexao_banco import trocar_tabela_staging, upload_particionado
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'teste.db'}")
+    yield engine
+    engine.dispose()
+
+def contar(engine, tabela):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {tabela}")).scalar()
+
+#---------------------------------------------------
+# Troca da staging pela tabela final
+#---------------------------------------------------
+def test_troca_substitui_a_tabela_final(engine):
+    pd.DataFrame({'a': [1, 2]}).to_sql('t', engine, index=False)
+    pd.DataFrame({'a': [1, 2, 3]}).to_sql('t_staging', engine, index=False)
+    trocar_tabela_staging(engine, None, 't_staging', 't')
+    assert contar(engine, 't') == 3
+    assert not inspect(engine).has_table('t_staging')
+
+def test_troca_que_falha_preserva_a_tabela_final(engine):
+    pd.DataFrame({'a': [1, 2]}).to_sql('t', engine, index=False)
+    with pytest.raises(Exception):
+        trocar_tabela_staging(engine, None, 't_staging', 't')  # Staging inexistente: o RENAME falha
+    assert contar(engine, 't') == 2  # O DROP TABLE foi desfeito junto
+
+#---------------------------------------------------
+# Upload particionado: falhas, retomada e queda após a troca
+#---------------------------------------------------
+@pytest.fixture
+def dados():
+    return pd.DataFrame({'cliente_id': [f"id-{i}" for i in range(50)], 'valor': range(50)})
+
+def falhar_particoes(monkeypatch, falhas):
+    """Faz o to_sql das partições (não vazias) falhar nas chamadas de número em `falhas` (contando de 0)."""
+    original, chamadas = pd.DataFrame.to_sql, {'n': 0}
+
+    def to_sql(self, *args, **kwargs):
+        if len(self):
+            chamadas['n'] += 1
+            if chamadas['n'] - 1 in falhas:
+                raise RuntimeError('queda simulada')
+        return original(self, *args, **kwargs)
+    monkeypatch.setattr(pd.DataFrame, 'to_sql', to_sql)
+
+def enviar(dados, engine, checkpoint, **opcoes):
+    upload_particionado(dados, engine, None, 't', tamanho_particao=10, workers=1, espera=0,
+                        checkpoint_path=str(checkpoint), **opcoes)
+
+def test_falha_temporaria_e_repetida_sem_duplicar(engine, dados, tmp_path, monkeypatch):
+    falhar_particoes(monkeypatch, {2})
+    enviar(dados, engine, tmp_path / 'checkpoint.json', tentativas=2)
+    assert contar(engine, 't') == len(dados)
+
+def test_retomada_envia_so_as_particoes_que_faltam(engine, dados, tmp_path, monkeypatch, capsys):
+    checkpoint = tmp_path / 'checkpoint.json'
+    with monkeypatch.context() as m:
+        falhar_particoes(m, set(range(2, 5)))
+        with pytest.raises(RuntimeError):
+            enviar(dados, engine, checkpoint, tentativas=1)
+    assert checkpoint.exists()
+    assert not inspect(engine).has_table('t')
+
+    enviar(dados, engine, checkpoint)
+    assert "2 de 5 partições já enviadas" in capsys.readouterr().out
+    assert contar(engine, 't') == len(dados)
+    assert pd.read_sql('SELECT cliente_id FROM t', engine)['cliente_id'].is_unique
+    assert not checkpoint.exists()
+    assert not inspect(engine).has_table('t_staging_particoes')
+
+def test_queda_depois_da_troca_nao_refaz_a_carga(engine, dados, tmp_path, monkeypatch, capsys):
+    checkpoint = tmp_path / 'checkpoint.json'
+
+    def cair(caminho):
+        raise RuntimeError('queda simulada')
+    with monkeypatch.context() as m:
+        m.setattr(conexao_banco.os, 'remove', cair)  # Queda logo após a troca, antes de apagar o checkpoint
+        with pytest.raises(RuntimeError):
+            enviar(dados, engine, checkpoint)
+    assert checkpoint.exists()
+    assert contar(engine, 't') == len(dados)
+
+    enviar(dados, engine, checkpoint)
+    assert "já concluído" in capsys.readouterr().out
+    assert contar(engine, 't') == len(dados)
+    assert not checkpoint.exists()